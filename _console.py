@@ -0,0 +1,24 @@
+"""
+Queued console output for the webhook test scripts.
+Lines go through a QueueHandler and a QueueListener thread writes them to
+stdout, so the coroutines under test never block on terminal writes.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+_queue = queue.SimpleQueue()
+_stdout = logging.StreamHandler(sys.stdout)
+_stdout.setFormatter(logging.Formatter("%(message)s"))
+_listener = logging.handlers.QueueListener(_queue, _stdout)
+_listener.start()
+# Drain anything still queued before the interpreter exits
+atexit.register(_listener.stop)
+
+log = logging.getLogger("alerttest")
+log.setLevel(logging.INFO)
+log.propagate = False
+log.addHandler(logging.handlers.QueueHandler(_queue))
@@ -0,0 +1,25 @@
+"""
+JSON helpers for the standalone test scripts.
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def pretty(obj) -> str:
+    """Indented JSON for console output."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
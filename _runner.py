@@ -0,0 +1,25 @@
+"""
+Shared event loop for the standalone test scripts.
+Lets several scripts (or a driver that imports them) reuse one loop instead of
+building and tearing one down per asyncio.run() call.
+"""
+
+import asyncio
+
+# Optional: libuv-based event loop when uvloop is installed
+try:
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
+_loop = None
+
+
+def run(coro):
+    """Run a coroutine to completion on the shared event loop."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = _new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
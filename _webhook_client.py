@@ -0,0 +1,76 @@
+"""
+Shared HTTP client for the webhook test scripts.
+One keep-alive pool is reused for every alert POST instead of opening a new
+connection per request.
+"""
+
+import asyncio
+import os
+import time
+import httpx
+
+# Send alerts as msgpack-encoded fields instead of TradingView text
+USE_BINARY = os.getenv("USE_BINARY", "false") == "true"
+if USE_BINARY:
+    import msgpack
+
+# Compress alert bodies with zstd (Content-Encoding: zstd) when testing a remote deployment
+USE_ZSTD = os.getenv("USE_ZSTD", "false") == "true"
+if USE_ZSTD:
+    import zstandard
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+
+client = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    timeout=30.0
+)
+
+
+def alert_request(alert_text: str, alert_fields: dict):
+    """Return (content, headers) for an alert POST in the configured transport.
+    Build this once per alert and reuse the bytes for repeated sends."""
+    if USE_BINARY:
+        body = msgpack.packb(alert_fields)
+        content_type = "application/msgpack"
+    else:
+        body = alert_text.encode("utf-8")
+        content_type = "text/plain"
+    headers = {"Content-Type": content_type}
+    if USE_ZSTD:
+        body = _ZSTD_COMPRESSOR.compress(body)
+        headers["Content-Encoding"] = "zstd"
+    headers["Content-Length"] = str(len(body))
+    return body, headers
+
+
+async def post_one(url: str, body: bytes, headers: dict, sem: asyncio.Semaphore):
+    """POST one body under the semaphore and return (status_code, latency_seconds)"""
+    async with sem:
+        t0 = time.perf_counter()
+        try:
+            response = await client.post(url, content=body, headers=headers)
+        except httpx.HTTPError:
+            return None, time.perf_counter() - t0
+        return response.status_code, time.perf_counter() - t0
+
+
+async def orchestrate(url: str, bodies, headers: dict, concurrency: int = 50):
+    """POST every body concurrently, at most `concurrency` in flight, in input order"""
+    sem = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(post_one(url, body, headers, sem) for body in bodies))
+
+
+def latency_percentiles(results) -> dict:
+    """p50/p95/p99 latency in milliseconds from orchestrate() results"""
+    latencies = sorted(latency for _, latency in results)
+    if not latencies:
+        return {}
+    return {
+        f"p{p}": latencies[max(0, (len(latencies) * p + 99) // 100 - 1)] * 1000
+        for p in (50, 95, 99)
+    }
+
+
+async def aclose():
+    """Close the shared connection pool"""
+    await client.aclose()
@@ -4,6 +4,8 @@ import json
 import asyncio
 import traceback
 import time
+import hashlib
+import re
 from datetime import datetime, timedelta
 from fastapi import FastAPI, Request, HTTPException
 from tradovate_api import TradovateClient
@@ -17,14 +19,36 @@ except ImportError:
     FORWARD_TESTING_ENABLED = False
     logging.warning("⚠️ Forward testing disabled - enhanced_forward_test_manager not found")
 
+# Optional binary alert transport (Content-Type: application/msgpack) for load tests
+try:
+    import msgpack
+    MSGPACK_ENABLED = True
+except ImportError:
+    MSGPACK_ENABLED = False
+
+# Optional zstd request bodies (Content-Encoding: zstd) for remote load tests
+try:
+    import zstandard
+    ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+    ZSTD_ENABLED = True
+except ImportError:
+    ZSTD_ENABLED = False
+
 
 # 🔥 RELAXED DUPLICATE DETECTION FOR AUTOMATED TRADING
-last_alert = {}  # {symbol: {"direction": "buy"/"sell", "timestamp": datetime, "alert_hash": str}}
+last_alert = {}  # {symbol: {"direction": "buy"/"sell", "timestamp": datetime, "alert_key": tuple}}
 completed_trades = {}  # {symbol: {"last_completed_direction": "buy"/"sell", "completion_time": datetime}}
 active_orders = []  # Track active order IDs to manage cancellation
 DUPLICATE_THRESHOLD_SECONDS = 30  # 30 seconds - only prevent rapid-fire identical alerts
 COMPLETED_TRADE_COOLDOWN = 30  # 30 seconds - minimal cooldown for automated trading
 
+# One alert line: a bare BUY/SELL action or a KEY=VALUE pair
+ALERT_LINE_RE = re.compile(
+    # [^\S\n] is any whitespace except the newline itself (\r, \f, \v, NBSP, ...), matching str.strip()
+    r"^[^\S\n]*(?:(?P<action>buy|sell)|(?P<key>[^=\n]*?)[^\S\n]*=[^\S\n]*(?P<value>[^\n]*?))[^\S\n]*$",
+    re.MULTILINE | re.IGNORECASE
+)
+
 
 WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
 logging.info(f"Loaded WEBHOOK_SECRET: {WEBHOOK_SECRET}")
@@ -37,7 +61,8 @@ os.makedirs(LOG_DIR, exist_ok=True)
 log_file = os.path.join(LOG_DIR, "webhook_trades.log")
 logging.basicConfig(
     handlers=[
-        logging.FileHandler(log_file),
+        # Explicit UTF-8 so the emoji-tagged client logs never hit the locale codec (cp1252 on Windows)
+        logging.FileHandler(log_file, encoding="utf-8"),
         logging.StreamHandler()
     ],
     level=logging.INFO,
@@ -81,64 +106,61 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Close the Tradovate connection pool with the app, not with an individual request
+    await client.aclose()
+
+
 
 
 async def cancel_all_orders(symbol):
     # Cancel all open orders for the symbol, regardless of status, and double-check after
-    list_url = f"https://demo-api.tradovate.com/v1/order/list"
-    cancel_url = f"https://demo-api.tradovate.com/v1/order/cancel"
-    headers = {"Authorization": f"Bearer {client.access_token}"}
-    async with httpx.AsyncClient() as http_client:
-        # Repeat cancel attempts until no open orders remain (with a max retry limit)
-        max_retries = 8
-        for attempt in range(max_retries):
-            resp = await http_client.get(list_url, headers=headers)
-            resp.raise_for_status()
-            orders = resp.json()
-            # Cancel ALL orders for the symbol, regardless of status (except Filled/Cancelled/Rejected)
-            open_orders = [o for o in orders if o.get("symbol") == symbol and o.get("status") not in ("Filled", "Cancelled", "Rejected")]
-            if not open_orders:
-                break
-            for order in open_orders:
-                oid = order.get("id")
-                if oid:
-                    try:
-                        await http_client.post(f"{cancel_url}/{oid}", headers=headers)
-                        logging.info(f"Cancelled order {oid} for {symbol} (status: {order.get('status')})")
-                    except Exception as e:
-                        logging.error(f"Failed to cancel order {oid} for {symbol}: {e}")
-            await asyncio.sleep(0.5)
-        # Final check and log if any remain
-        resp = await http_client.get(list_url, headers=headers)
+    # client.get/post take paths relative to the API base URL and send the Authorization header
+    # Repeat cancel attempts until no open orders remain (with a max retry limit)
+    max_retries = 8
+    for attempt in range(max_retries):
+        resp = await client.get("/order/list")
         resp.raise_for_status()
         orders = resp.json()
+        # Cancel ALL orders for the symbol, regardless of status (except Filled/Cancelled/Rejected)
         open_orders = [o for o in orders if o.get("symbol") == symbol and o.get("status") not in ("Filled", "Cancelled", "Rejected")]
-        if open_orders:
-            logging.error(f"After repeated cancel attempts, still found open orders for {symbol}: {[o.get('id') for o in open_orders]} (statuses: {[o.get('status') for o in open_orders]})")
+        if not open_orders:
+            break
+        for order in open_orders:
+            oid = order.get("id")
+            if oid:
+                try:
+                    await client.post(f"/order/cancel/{oid}")
+                    logging.info(f"Cancelled order {oid} for {symbol} (status: {order.get('status')})")
+                except Exception as e:
+                    logging.error(f"Failed to cancel order {oid} for {symbol}: {e}")
+        await asyncio.sleep(0.5)
+    # Final check and log if any remain
+    resp = await client.get("/order/list")
+    resp.raise_for_status()
+    orders = resp.json()
+    open_orders = [o for o in orders if o.get("symbol") == symbol and o.get("status") not in ("Filled", "Cancelled", "Rejected")]
+    if open_orders:
+        logging.error(f"After repeated cancel attempts, still found open orders for {symbol}: {[o.get('id') for o in open_orders]} (statuses: {[o.get('status') for o in open_orders]})")
 
 
 async def flatten_position(symbol):
-    url = f"https://demo-api.tradovate.com/v1/position/closeposition"
-    headers = {"Authorization": f"Bearer {client.access_token}"}
-    async with httpx.AsyncClient() as http_client:
-        await http_client.post(url, headers=headers, json={"symbol": symbol})
+    await client.post("/position/closeposition", json={"symbol": symbol})
 
 
 async def wait_until_no_open_orders(symbol, timeout=10):
     """
     Poll Tradovate until there are no open orders for the symbol, or until timeout (seconds).
     """
-    url = f"https://demo-api.tradovate.com/v1/order/list"
-    headers = {"Authorization": f"Bearer {client.access_token}"}
     start = asyncio.get_event_loop().time()
     while True:
-        async with httpx.AsyncClient() as http_client:
-            resp = await http_client.get(url, headers=headers)
-            resp.raise_for_status()
-            orders = resp.json()
-            open_orders = [o for o in orders if o.get("symbol") == symbol and o.get("status") in ("Working", "Accepted")]
-            if not open_orders:
-                return
+        resp = await client.get("/order/list")
+        resp.raise_for_status()
+        orders = resp.json()
+        open_orders = [o for o in orders if o.get("symbol") == symbol and o.get("status") in ("Working", "Accepted")]
+        if not open_orders:
+            return
         if asyncio.get_event_loop().time() - start > timeout:
             logging.warning(f"Timeout waiting for all open orders to clear for {symbol}.")
             return
@@ -158,16 +180,13 @@ def parse_alert_to_tradovate_json(alert_text: str, account_id: int) -> dict:
             raise ValueError(f"Error parsing JSON-like structure: {e}")
 
 
-    for line in alert_text.split("\n"):
-        if "=" in line:
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip()
+    # Single pass over the alert body instead of splitting each line; the full
+    # result is logged once below rather than once per field
+    for action, key, value in ALERT_LINE_RE.findall(alert_text):
+        if action:
+            parsed_data["action"] = action.capitalize()
+        else:
             parsed_data[key] = value
-            logging.info(f"Parsed {key} = {value}")
-        elif line.strip().upper() in ["BUY", "SELL"]:
-            parsed_data["action"] = line.strip().capitalize()
-            logging.info(f"Parsed action = {parsed_data['action']}")
 
 
     logging.info(f"Complete parsed alert data: {parsed_data}")
@@ -188,6 +207,11 @@ def parse_alert_to_tradovate_json(alert_text: str, account_id: int) -> dict:
     return parsed_data
 
 
+def alert_key(data: dict) -> tuple:
+    """Essential trading fields identifying an alert, compared directly for duplicate detection."""
+    return (data.get("symbol"), data.get("action"), data.get("PRICE"), data.get("T1"), data.get("STOP"))
+
+
 def hash_alert(data: dict) -> str:
     """Generate a unique hash for an alert to detect duplicates."""
     # Only include essential trading fields for duplicate detection
@@ -199,7 +223,8 @@ def hash_alert(data: dict) -> str:
         "STOP": data.get("STOP")
     }
     alert_string = json.dumps(essential_fields, sort_keys=True)
-    return hashlib.sha256(alert_string.encode()).hexdigest()
+    # One-shot digest of a single buffer; not a security use, so OpenSSL's fast path applies
+    return hashlib.sha256(alert_string.encode(), usedforsecurity=False).hexdigest()
 
 
 def is_duplicate_alert(symbol: str, action: str, data: dict) -> bool:
@@ -213,7 +238,7 @@ def is_duplicate_alert(symbol: str, action: str, data: dict) -> bool:
     1. IDENTICAL alert hash received within 30 seconds (prevents accidental spam)
     """
     current_time = datetime.now()
-    alert_hash = hash_alert(data)
+    key = alert_key(data)
    
     # ONLY Check for rapid-fire identical alerts (same exact parameters)
     if symbol in last_alert:
@@ -221,7 +246,7 @@ def is_duplicate_alert(symbol: str, action: str, data: dict) -> bool:
         time_diff = (current_time - last_alert_data["timestamp"]).total_seconds()
        
         # Only block if EXACT same alert within 30 seconds
-        if (last_alert_data.get("alert_hash") == alert_hash and
+        if (last_alert_data.get("alert_key") == key and
             time_diff < DUPLICATE_THRESHOLD_SECONDS):
             logging.warning(f"🚫 RAPID-FIRE DUPLICATE BLOCKED: {symbol} {action}")
             logging.warning(f"🚫 Identical alert received {time_diff:.1f} seconds ago")
@@ -235,7 +260,7 @@ def is_duplicate_alert(symbol: str, action: str, data: dict) -> bool:
     last_alert[symbol] = {
         "direction": action.lower(),
         "timestamp": current_time,
-        "alert_hash": alert_hash
+        "alert_key": key
     }
    
     logging.info(f"✅ ALERT ACCEPTED: {symbol} {action} - Automated trading enabled")
@@ -302,7 +327,6 @@ async def monitor_all_orders(order_tracking, symbol, stop_order_data=None):
 
     while True:
         try:
-            headers = {"Authorization": f"Bearer {client.access_token}"}
             active_orders = {}
             logging.info(f"Order tracking state: {order_tracking}")
 
@@ -312,11 +336,9 @@ async def monitor_all_orders(order_tracking, symbol, stop_order_data=None):
                     continue
 
 
-                url = f"https://demo-api.tradovate.com/v1/order/{order_id}"
-                async with httpx.AsyncClient() as http_client:
-                    response = await http_client.get(url, headers=headers)
-                    response.raise_for_status()
-                    order_status = response.json()
+                response = await client.get(f"/order/{order_id}")
+                response.raise_for_status()
+                order_status = response.json()
 
 
                 status = order_status.get("status")
@@ -347,21 +369,16 @@ async def monitor_all_orders(order_tracking, symbol, stop_order_data=None):
 
 
                         try:
-                            async with httpx.AsyncClient() as http_client:
-                                response = await http_client.post(
-                                    f"https://demo-api.tradovate.com/v1/order/placeOSO",
-                                    headers={"Authorization": f"Bearer {client.access_token}", "Content-Type": "application/json"},
-                                    json=oso_payload
-                                )
-                                response.raise_for_status()
-                                oso_result = response.json()
-
-
-                                if "orderId" in oso_result:
-                                    logging.info(f"OSO order placed successfully: {oso_result}")
-                                    stop_placed = True
-                                else:
-                                    raise ValueError(f"Failed to place OSO order: {oso_result}")
+                            response = await client.post("/order/placeOSO", json=oso_payload)
+                            response.raise_for_status()
+                            oso_result = response.json()
+
+
+                            if "orderId" in oso_result:
+                                logging.info(f"OSO order placed successfully: {oso_result}")
+                                stop_placed = True
+                            else:
+                                raise ValueError(f"Failed to place OSO order: {oso_result}")
                         except Exception as e:
                             logging.error(f"Error placing OSO order: {e}")
 
@@ -373,14 +390,12 @@ async def monitor_all_orders(order_tracking, symbol, stop_order_data=None):
 
 
                     if order_tracking.get("TP1"):
-                        cancel_url = f"https://demo-api.tradovate.com/v1/order/cancel/{order_tracking['TP1']}"
                         try:
-                            async with httpx.AsyncClient() as http_client:
-                                resp = await http_client.post(cancel_url, headers=headers)
-                                if resp.status_code == 200:
-                                    logging.info(f"TP1 order {order_tracking['TP1']} cancelled after STOP fill.")
-                                else:
-                                    logging.warning(f"Failed to cancel TP1 order after STOP fill. Status: {resp.status_code}")
+                            resp = await client.post(f"/order/cancel/{order_tracking['TP1']}")
+                            if resp.status_code == 200:
+                                logging.info(f"TP1 order {order_tracking['TP1']} cancelled after STOP fill.")
+                            else:
+                                logging.warning(f"Failed to cancel TP1 order after STOP fill. Status: {resp.status_code}")
                         except Exception as e:
                             logging.error(f"Exception while cancelling TP1 order after STOP fill: {e}")
                     return
@@ -393,14 +408,12 @@ async def monitor_all_orders(order_tracking, symbol, stop_order_data=None):
 
 
                     if order_tracking.get("STOP"):
-                        cancel_url = f"https://demo-api.tradovate.com/v1/order/cancel/{order_tracking['STOP']}"
                         try:
-                            async with httpx.AsyncClient() as http_client:
-                                resp = await http_client.post(cancel_url, headers=headers)
-                                if resp.status_code == 200:
-                                    logging.info(f"STOP order {order_tracking['STOP']} cancelled after TP1 fill.")
-                                else:
-                                    logging.warning(f"Failed to cancel STOP order after TP1 fill. Status: {resp.status_code}")
+                            resp = await client.post(f"/order/cancel/{order_tracking['STOP']}")
+                            if resp.status_code == 200:
+                                logging.info(f"STOP order {order_tracking['STOP']} cancelled after TP1 fill.")
+                            else:
+                                logging.warning(f"Failed to cancel STOP order after TP1 fill. Status: {resp.status_code}")
                         except Exception as e:
                             logging.error(f"Exception while cancelling STOP order after TP1 fill: {e}")
                     return
@@ -441,11 +454,19 @@ async def webhook(req: Request, config_id: str = Query(None)):
         # Parse the incoming request
         content_type = req.headers.get("content-type")
         raw_body = await req.body()
+        content_encoding = req.headers.get("content-encoding")
+        if content_encoding == "zstd" and ZSTD_ENABLED:
+            raw_body = ZSTD_DECOMPRESSOR.decompress(raw_body)
+        elif content_encoding and content_encoding != "identity":
+            logging.error(f"Unsupported content encoding: {content_encoding}")
+            raise HTTPException(status_code=400, detail="Unsupported content encoding")
         logging.info(f"Content-Type: {content_type}")
-        logging.info(f"Raw body: {raw_body.decode('utf-8')}")
+        logging.info(f"Raw body: {raw_body.decode('utf-8', errors='replace')}")
 
         if content_type == "application/json":
-            data = await req.json()
+            data = json.loads(raw_body)
+        elif content_type == "application/msgpack" and MSGPACK_ENABLED:
+            data = msgpack.unpackb(raw_body)
         elif content_type.startswith("text/plain"):
             text_data = raw_body.decode("utf-8")
             data = parse_alert_to_tradovate_json(text_data, client.account_id)
@@ -7,7 +7,7 @@ import traceback
 import time
 from datetime import datetime, timedelta
 from fastapi import FastAPI, Request, HTTPException
-from tradovate_api import TradovateClient  # 🚀 Use optimized client
+from tradovate_api_optimized import TradovateClient, close_http_client  # 🚀 Use optimized client
 import uvicorn
 import httpx
 import hashlib
@@ -89,6 +89,7 @@ async def shutdown_event():
     logging.info("=== 🚀 APPLICATION SHUTTING DOWN ===")
     try:
         await client.close_client()
+        await close_http_client()
         logging.info("✅ HTTP client connections closed")
     except Exception as e:
         logging.error(f"Error during shutdown: {e}")
@@ -7,11 +7,22 @@ This script tests the order cancellation and OCO/OSO placement logic.
 import asyncio
 import json
 import logging
+import sys
 from tradovate_api import TradovateClient
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+_BANNER = """🧪 Testing Tradovate Order Management Functionality
+This test will:
+1. Authenticate with Tradovate API
+2. Get current pending orders
+3. Test order cancellation
+4. Test OCO/OSO order placement
+5. Verify final state
+
+""" + "=" * 50 + "\n"
+
 async def test_order_management():
     """Test order management functionality"""
     client = TradovateClient()
@@ -142,18 +153,9 @@ async def test_order_management():
         logging.info("\n=== ORDER MANAGEMENT TEST COMPLETED ===")
         
     except Exception as e:
-        logging.error(f"❌ Test failed: {e}")
-        import traceback
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception(f"❌ Test failed: {e}")
 
 if __name__ == "__main__":
-    print("🧪 Testing Tradovate Order Management Functionality")
-    print("This test will:")
-    print("1. Authenticate with Tradovate API")
-    print("2. Get current pending orders")
-    print("3. Test order cancellation")
-    print("4. Test OCO/OSO order placement")
-    print("5. Verify final state")
-    print("\n" + "="*50)
+    sys.stdout.write(_BANNER)
     
     asyncio.run(test_order_management())
@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import traceback
 from tradovate_api import TradovateClient
 
 # Setup logging
@@ -73,13 +74,11 @@ async def test_oso_structure():
             print(f"Result: {json.dumps(result, indent=2)}")
         except Exception as e:
             print(f"❌ OSO ORDER FAILED: {e}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            traceback.print_exc()
         
     except Exception as e:
         print(f"❌ ERROR during testing: {e}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
+        traceback.print_exc()
 
 if __name__ == "__main__":
     asyncio.run(test_oso_structure())
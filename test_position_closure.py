@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import traceback
 from tradovate_api import TradovateClient
 
 # Setup logging
@@ -57,8 +58,7 @@ async def test_position_closure():
         
     except Exception as e:
         print(f"❌ ERROR during testing: {e}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
+        traceback.print_exc()
 
 if __name__ == "__main__":
     asyncio.run(test_position_closure())
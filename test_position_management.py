@@ -4,14 +4,26 @@ Test script for position management functionality in the Tradovate webhook.
 This script tests the position closure functionality.
 """
 
-import asyncio
 import json
 import logging
+import sys
 from tradovate_api import TradovateClient
+from _runner import run
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+_BANNER = """🧪 Testing Tradovate Position Management Functionality
+This test will:
+1. Authenticate with Tradovate API
+2. Get current open positions
+3. Test individual position closure
+4. Test close all positions
+5. Verify final state
+6. Test edge cases
+
+""" + "=" * 50 + "\n"
+
 async def test_position_management():
     """Test position management functionality"""
     client = TradovateClient()
@@ -95,19 +107,9 @@ async def test_position_management():
         logging.info("\n=== POSITION MANAGEMENT TEST COMPLETED ===")
         
     except Exception as e:
-        logging.error(f"❌ Test failed: {e}")
-        import traceback
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception(f"❌ Test failed: {e}")
 
 if __name__ == "__main__":
-    print("🧪 Testing Tradovate Position Management Functionality")
-    print("This test will:")
-    print("1. Authenticate with Tradovate API")
-    print("2. Get current open positions")
-    print("3. Test individual position closure")
-    print("4. Test close all positions")
-    print("5. Verify final state")
-    print("6. Test edge cases")
-    print("\n" + "="*50)
+    sys.stdout.write(_BANNER)
     
-    asyncio.run(test_position_management())
+    run(test_position_management())
@@ -4,9 +4,10 @@
 This test will help us understand the actual Tradovate position object structure
 """
 
-import asyncio
 import logging
+import traceback
 from tradovate_api import TradovateClient
+from _runner import run
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -66,8 +67,7 @@ async def test_position_structure():
         
     except Exception as e:
         print(f"❌ TEST FAILED: {e}")
-        import traceback
-        print(f"   Traceback: {traceback.format_exc()}")
+        traceback.print_exc()
 
 if __name__ == "__main__":
-    asyncio.run(test_position_structure())
+    run(test_position_structure())
@@ -1,6 +1,10 @@
 import sys
 import os
-sys.path.append(os.path.dirname(__file__))
+import inspect
+
+_here = os.path.dirname(os.path.abspath(__file__))
+if _here not in sys.path:
+    sys.path.insert(0, _here)
 
 try:
     print("Testing basic import...")
@@ -8,7 +12,8 @@ try:
     print("✓ Successfully imported monitor_all_orders")
     
     print("Testing function signature...")
-    import inspect
+    if "__signature__" not in vars(monitor_all_orders):
+        monitor_all_orders.__signature__ = inspect.signature(monitor_all_orders)
     sig = inspect.signature(monitor_all_orders)
     print(f"✓ Function signature: {sig}")
     
@@ -13,12 +13,31 @@ from typing import Dict, Any, List
 from unittest.mock import AsyncMock, patch, MagicMock
 import sys
 import os
+import math
+from collections import defaultdict
+from types import MappingProxyType
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from tradovate_api import TradovateClient
-from main import webhook_optimized
+from main_optimized import webhook_optimized
+
+# Read-only mock fixtures shared by the parallel cancel/close tests
+_NOW = int(time.time())
+_MOCK_ORDERS = tuple(
+    MappingProxyType({"orderId": f"order_{i}", "orderStatus": "Working", "contractId": 12345})
+    for i in range(5)
+)
+_MOCK_POSITIONS = tuple(
+    MappingProxyType({
+        "positionId": f"pos_{i}",
+        "contractId": 12345,
+        "netPos": 2 if i % 2 == 0 else -2,
+        "timestamp": _NOW
+    })
+    for i in range(3)
+)
 
 class SpeedTestMetrics:
     """Track performance metrics during testing"""
@@ -28,6 +47,8 @@ class SpeedTestMetrics:
         self.api_call_times = []
         self.order_processing_times = []
         self.position_closure_times = []
+        # Running aggregates per operation: [sum, min, max, count]
+        self._agg = defaultdict(lambda: [0.0, math.inf, -math.inf, 0])
     
     def add_execution_time(self, operation: str, duration: float):
         self.execution_times.append({
@@ -35,22 +56,31 @@ class SpeedTestMetrics:
             'duration': duration,
             'timestamp': time.time()
         })
+        agg = self._agg[operation]
+        agg[0] += duration
+        agg[1] = min(agg[1], duration)
+        agg[2] = max(agg[2], duration)
+        agg[3] += 1
     
     def get_average_time(self, operation: str) -> float:
-        times = [t['duration'] for t in self.execution_times if t['operation'] == operation]
-        return sum(times) / len(times) if times else 0
+        agg = self._agg.get(operation)
+        return agg[0] / agg[3] if agg else 0
     
     def print_summary(self):
         print("\n=== SPEED TEST SUMMARY ===")
-        operations = set(t['operation'] for t in self.execution_times)
-        for op in operations:
-            avg_time = self.get_average_time(op)
-            times = [t['duration'] for t in self.execution_times if t['operation'] == op]
-            print(f"{op}: avg={avg_time:.3f}s, min={min(times):.3f}s, max={max(times):.3f}s, count={len(times)}")
+        for op, (total, min_time, max_time, count) in self._agg.items():
+            print(f"{op}: avg={total / count:.3f}s, min={min_time:.3f}s, max={max_time:.3f}s, count={count}")
 
 # Global metrics tracker
 metrics = SpeedTestMetrics()
 
+_COMPLETE_BANNER = (
+    "\n" + "=" * 50 + "\n"
+    "SPEED OPTIMIZATION TESTING COMPLETE\n"
+    + "=" * 50 + "\n"
+    "\nRunning detailed pytest suite...\n"
+)
+
 async def time_operation(operation_name: str, coro):
     """Time an async operation and record metrics"""
     start_time = time.time()
@@ -123,13 +153,7 @@ class TestSpeedOptimization:
         """Test parallel order cancellation speed"""
         print("\n=== Testing Parallel Order Cancellation ===")
         
-        # Mock pending orders
-        mock_orders = [
-            {"orderId": f"order_{i}", "orderStatus": "Working", "contractId": 12345}
-            for i in range(5)
-        ]
-        
-        with patch.object(mock_client, 'get_pending_orders', return_value=mock_orders):
+        with patch.object(mock_client, 'get_pending_orders', return_value=_MOCK_ORDERS):
             with patch.object(mock_client, '_cancel_order_fast', return_value=True):
                 result = await time_operation(
                     "parallel_cancel_orders", 
@@ -144,18 +168,7 @@ class TestSpeedOptimization:
         """Test parallel position closure speed"""
         print("\n=== Testing Parallel Position Closure ===")
         
-        # Mock positions
-        mock_positions = [
-            {
-                "positionId": f"pos_{i}",
-                "contractId": 12345,
-                "netPos": 2 if i % 2 == 0 else -2,
-                "timestamp": int(time.time())
-            }
-            for i in range(3)
-        ]
-        
-        with patch.object(mock_client, 'get_positions', return_value=mock_positions):
+        with patch.object(mock_client, 'get_positions', return_value=_MOCK_POSITIONS):
             with patch.object(mock_client, '_fast_close_position', return_value={"orderId": "test_order"}):
                 result = await time_operation(
                     "parallel_close_positions",
@@ -198,7 +211,7 @@ class TestSpeedOptimization:
         print("\n=== Testing Complete Webhook Speed ===")
         
         # Mock all external dependencies
-        with patch('main.TradovateClient') as MockClient:
+        with patch('main_optimized.TradovateClient') as MockClient:
             mock_client = AsyncMock()
             MockClient.return_value = mock_client
             
@@ -256,15 +269,10 @@ class TestSpeedOptimization:
         client = TradovateClient("test", "test", "test")
         http_client = client._get_http_client()
         
-        # Verify optimized timeouts
-        assert http_client.timeout.connect == 3.0, "Connect timeout should be 3.0s"
-        assert http_client.timeout.read == 8.0, "Read timeout should be 8.0s"
-        assert http_client.timeout.write == 3.0, "Write timeout should be 3.0s"
-        
-        # Verify connection limits
-        limits = http_client.limits
-        assert limits.max_keepalive_connections == 15, "Should have 15 keepalive connections"
-        assert limits.max_connections == 30, "Should have 30 max connections"
+        # Verify optimized timeouts and connection limits in one comparison
+        got = (http_client.timeout.connect, http_client.timeout.read, http_client.timeout.write,
+               http_client.limits.max_keepalive_connections, http_client.limits.max_connections)
+        assert got == (3.0, 8.0, 3.0, 15, 30), f"HTTP client config drift: {got}"
         
         print("✓ HTTP client configuration optimized")
 
@@ -293,10 +301,10 @@ async def run_performance_benchmark():
     
     # Test scenarios
     test_scenarios = [
-        ("HTTP Connection Pool", test_http_connection_speed(client)),
-        ("Parallel Order Operations", test_parallel_operations(client)),
-        ("Dynamic Polling System", test_dynamic_polling(client)),
-        ("Complete Webhook Flow", test_complete_flow(client)),
+        ("HTTP Connection Pool", bench_http_connection_speed(client)),
+        ("Parallel Order Operations", bench_parallel_operations(client)),
+        ("Dynamic Polling System", bench_dynamic_polling(client)),
+        ("Complete Webhook Flow", bench_complete_flow(client)),
     ]
     
     for scenario_name, test_coro in test_scenarios:
@@ -309,7 +317,7 @@ async def run_performance_benchmark():
     # Print final metrics
     metrics.print_summary()
 
-async def test_http_connection_speed(client):
+async def bench_http_connection_speed(client):
     """Test HTTP connection speed with pooling"""
     tasks = []
     for i in range(20):
@@ -318,14 +326,10 @@ async def test_http_connection_speed(client):
     
     await asyncio.gather(*tasks, return_exceptions=True)
 
-async def test_parallel_operations(client):
+async def bench_parallel_operations(client):
     """Test parallel order operations"""
-    # Mock some orders and positions
-    mock_orders = [{"orderId": f"order_{i}", "orderStatus": "Working"} for i in range(5)]
-    mock_positions = [{"positionId": f"pos_{i}", "netPos": 1} for i in range(3)]
-    
-    with patch.object(client, 'get_pending_orders', return_value=mock_orders):
-        with patch.object(client, 'get_positions', return_value=mock_positions):
+    with patch.object(client, 'get_pending_orders', return_value=_MOCK_ORDERS):
+        with patch.object(client, 'get_positions', return_value=_MOCK_POSITIONS):
             with patch.object(client, '_cancel_order_fast', return_value=True):
                 with patch.object(client, '_fast_close_position', return_value={"orderId": "close_order"}):
                     # Test parallel cancellation and closure
@@ -334,7 +338,7 @@ async def test_parallel_operations(client):
                     
                     await asyncio.gather(cancel_task, close_task)
 
-async def test_dynamic_polling(client):
+async def bench_dynamic_polling(client):
     """Test dynamic polling system"""
     mock_order = {"orderId": "test_order", "orderStatus": "Working"}
     
@@ -349,7 +353,7 @@ async def test_dynamic_polling(client):
     with patch.object(client, 'get_order_status', side_effect=mock_get_order_status):
         await client.monitor_all_orders_fast([mock_order], timeout=10)
 
-async def test_complete_flow(client):
+async def bench_complete_flow(client):
     """Test complete optimized webhook flow"""
     webhook_data = {
         "strategy": {
@@ -362,15 +366,15 @@ async def test_complete_flow(client):
         }
     }
     
-    with patch('main.TradovateClient', return_value=client):
+    with patch('main_optimized.TradovateClient', return_value=client):
         with patch.object(client, 'get_positions', return_value=[]):
             with patch.object(client, 'get_pending_orders', return_value=[]):
                 with patch.object(client, 'cancel_all_pending_orders', return_value=[]):
-                with patch.object(client, 'force_close_all_positions_immediately', return_value=[]):
-                    with patch.object(client, 'determine_optimal_order_type', return_value="Market"):
-                        with patch.object(client, 'place_order', return_value={"orderId": "test", "orderStatus": "Working"}):
-                            with patch.object(client, 'monitor_all_orders_fast', return_value=[{"orderId": "test", "orderStatus": "Filled"}]):
-                                await webhook_optimized(webhook_data)
+                    with patch.object(client, 'force_close_all_positions_immediately', return_value=[]):
+                        with patch.object(client, 'determine_optimal_order_type', return_value="Market"):
+                            with patch.object(client, 'place_order', return_value={"orderId": "test", "orderStatus": "Working"}):
+                                with patch.object(client, 'monitor_all_orders_fast', return_value=[{"orderId": "test", "orderStatus": "Filled"}]):
+                                    await webhook_optimized(webhook_data)
 
 if __name__ == "__main__":
     print("Starting Tradovate Webhook Speed Optimization Tests...")
@@ -378,10 +382,7 @@ if __name__ == "__main__":
     # Run the comprehensive benchmark
     asyncio.run(run_performance_benchmark())
     
-    print("\n" + "="*50)
-    print("SPEED OPTIMIZATION TESTING COMPLETE")
-    print("="*50)
+    sys.stdout.write(_COMPLETE_BANNER)
     
     # Run pytest for detailed testing
-    print("\nRunning detailed pytest suite...")
     pytest.main([__file__, "-v", "--tb=short"])
@@ -1,7 +1,8 @@
-import asyncio
-import json
 import logging
+import traceback
 from tradovate_api import TradovateClient
+from _runner import run
+from _jsonfmt import pretty
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -71,14 +72,14 @@ async def test_stop_entry_oso():
         }
         
         print("\n📋 STOP ENTRY OSO PAYLOAD:")
-        print(json.dumps(oso_payload, indent=2))
+        print(pretty(oso_payload))
         
         # Test the OSO order placement
         print("\n🚀 TESTING STOP ENTRY OSO ORDER PLACEMENT...")
         try:
             result = await client.place_oso_order(oso_payload)
             print("✅ STOP ENTRY OSO ORDER PLACED SUCCESSFULLY!")
-            print(f"Result: {json.dumps(result, indent=2)}")
+            print(f"Result: {pretty(result)}")
             
             print("\n🎯 EXPECTED BEHAVIOR:")
             print(f"   1. Entry order waits for price to reach {entry_price}")
@@ -89,13 +90,11 @@ async def test_stop_entry_oso():
             
         except Exception as e:
             print(f"❌ STOP ENTRY OSO ORDER FAILED: {e}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            traceback.print_exc()
         
     except Exception as e:
         print(f"❌ ERROR during testing: {e}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
+        traceback.print_exc()
 
 if __name__ == "__main__":
-    asyncio.run(test_stop_entry_oso())
+    run(test_stop_entry_oso())
@@ -4,11 +4,12 @@ Test script to verify stop order placement logic.
 This simulates the monitoring function to ensure STOP orders are placed correctly.
 """
 
-import asyncio
 import logging
-import json
 import sys
 from tradovate_api import TradovateClient
+from _console import log
+from _jsonfmt import pretty
+from _runner import run
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -16,7 +17,7 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 async def test_stop_order_placement():
     """Test the stop order placement logic"""
     
-    print("Starting stop order placement test...")
+    log.info("Starting stop order placement test...")
     
     # Sample stop order data that would be created in the webhook
     stop_order_data = {
@@ -30,42 +31,38 @@ async def test_stop_order_placement():
         "isAutomated": True
     }
     
-    # Initialize client
-    client = TradovateClient()
-    
     try:
-        print("Attempting authentication...")
-        # Authenticate
-        await client.authenticate()
-        print(f"✓ Authentication successful. Account ID: {client.account_id}")
-        
-        # Validate stop order data
-        required_fields = ["accountId", "symbol", "action", "orderQty", "orderType", "stopPrice"]
-        for field in required_fields:
-            if field not in stop_order_data:
-                raise ValueError(f"Missing required field in stop_order_data: {field}")
-        
-        print(f"✓ Stop order data validation passed")
-        print(f"Stop order data: {json.dumps(stop_order_data, indent=2)}")
+        log.info("Attempting authentication...")
+        # Authenticate once per process via the shared client
+        async with TradovateClient.shared() as client:
+            log.info(f"✓ Authentication successful. Account ID: {client.account_id}")
+            
+            # Validate stop order data
+            required_fields = ["accountId", "symbol", "action", "orderQty", "orderType", "stopPrice"]
+            for field in required_fields:
+                if field not in stop_order_data:
+                    raise ValueError(f"Missing required field in stop_order_data: {field}")
+            
+            log.info(f"✓ Stop order data validation passed")
+            log.info(f"Stop order data: {pretty(stop_order_data)}")
         
-        print("Test completed successfully!")
+        log.info("Test completed successfully!")
         return True
         
     except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"❌ Test failed: {e}")
         return False
+    finally:
+        # Release the shared client's HTTP/2 pool before the loop is left
+        await TradovateClient.close_shared()
 
 if __name__ == "__main__":
     try:
-        result = asyncio.run(test_stop_order_placement())
+        result = run(test_stop_order_placement())
         sys.exit(0 if result else 1)
     except KeyboardInterrupt:
-        print("Test interrupted")
+        log.info("Test interrupted")
         sys.exit(1)
     except Exception as e:
-        print(f"Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"Unexpected error: {e}")
         sys.exit(1)
@@ -2,8 +2,11 @@
 """
 Test script to send a sample TradingView alert to the webhook endpoint
 """
-import requests
-import json
+import asyncio
+from _console import log
+from _jsonfmt import loads
+from _runner import run
+from _webhook_client import client, aclose, alert_request
 
 # Sample TradingView alert message
 alert_message = """={"settlement-as-close":true,"symbol":"CME_MINI:NQ1!"}
@@ -14,38 +17,60 @@ T2=21411.71
 T3=21416.44
 STOP=21391.25"""
 
+# Same alert as parsed fields, used when USE_BINARY is enabled
+alert_fields = {
+    "settlement-as-close": True,
+    "symbol": "CME_MINI:NQ1!",
+    "action": "Buy",
+    "PRICE": 21402.25,
+    "T1": 21407.0445,
+    "T2": 21411.71,
+    "T3": 21416.44,
+    "STOP": 21391.25
+}
+
+# Request body is encoded once at import and reused for every send
+_ALERT_BODY, _ALERT_HEADERS = alert_request(alert_message, alert_fields)
+
 # Webhook URL (change to your deployed URL when testing remotely)
 webhook_url = "http://localhost:10000/webhook"
 
-def test_webhook():
-    print("Testing webhook with sample TradingView alert...")
-    print(f"Alert message:\n{alert_message}")
-    print(f"Webhook URL: {webhook_url}")
+_BANNER = """🧪 Testing Tradovate Webhook with Order Cancellation
+This will test:
+1. Single alert processing
+2. Multiple alerts with order cancellation
+3. OCO/OSO bracket order placement
+"""
+
+_FOOTER = "\n" + "=" * 50 + "\nTest completed. Check the webhook logs for detailed results."
+
+# Caps in-flight alert POSTs as more alert sequences are added
+ALERT_CONCURRENCY = 50
+
+async def test_webhook():
+    log.info("Testing webhook with sample TradingView alert...")
+    log.info(f"Alert message:\n{alert_message}")
+    log.info(f"Webhook URL: {webhook_url}")
     
     try:
-        response = requests.post(
-            webhook_url,
-            data=alert_message,
-            headers={"Content-Type": "text/plain"},
-            timeout=30
-        )
+        response = await client.post(webhook_url, content=_ALERT_BODY, headers=_ALERT_HEADERS)
         
-        print(f"\nResponse Status: {response.status_code}")
-        print(f"Response Headers: {dict(response.headers)}")
-        print(f"Response Body: {response.text}")
+        log.info(f"\nResponse Status: {response.status_code}")
+        log.info(f"Response Headers: {dict(response.headers)}")
+        log.info(f"Response Body: {response.text}")
         
         if response.status_code == 200:
-            print("✅ Webhook test successful!")
+            log.info("✅ Webhook test successful!")
         else:
-            print("❌ Webhook test failed!")
+            log.error("❌ Webhook test failed!")
             
     except Exception as e:
-        print(f"❌ Error testing webhook: {e}")
+        log.error(f"❌ Error testing webhook: {e}")
 
-def test_multiple_alerts():
+async def test_multiple_alerts():
     """Test multiple alerts to verify order cancellation logic"""
-    print("\n" + "="*50)
-    print("Testing multiple alerts to verify order cancellation...")
+    log.info("\n" + "="*50)
+    log.info("Testing multiple alerts to verify order cancellation...")
     
     # First alert - BUY
     buy_alert = """={"settlement-as-close":true,"symbol":"CME_MINI:NQ1!"}
@@ -55,6 +80,7 @@ T1=21407.0445
 T2=21411.71
 T3=21416.44
 STOP=21391.25"""
+    buy_fields = alert_fields
 
     # Second alert - SELL (should cancel previous orders)
     sell_alert = """={"settlement-as-close":true,"symbol":"CME_MINI:NQ1!"}
@@ -64,49 +90,79 @@ T1=21395.50
 T2=21391.00
 T3=21386.50
 STOP=21410.00"""
+    sell_fields = {
+        "settlement-as-close": True,
+        "symbol": "CME_MINI:NQ1!",
+        "action": "Sell",
+        "PRICE": 21400.00,
+        "T1": 21395.50,
+        "T2": 21391.00,
+        "T3": 21386.50,
+        "STOP": 21410.00
+    }
 
-    alerts = [
-        ("First BUY Alert", buy_alert),
-        ("Second SELL Alert (should cancel previous)", sell_alert)
+    # Alerts within a sequence must arrive in order (the SELL cancels the BUY);
+    # independent sequences are sent concurrently. Each alert is encoded once, in the configured transport
+    alert_sequences = [
+        [
+            ("First BUY Alert", alert_request(buy_alert, buy_fields)),
+            ("Second SELL Alert (should cancel previous)", alert_request(sell_alert, sell_fields))
+        ]
     ]
     
-    for alert_name, alert_data in alerts:
-        print(f"\n--- {alert_name} ---")
+    # Created here so the semaphore belongs to the loop that runs the sends
+    sem = asyncio.Semaphore(ALERT_CONCURRENCY)
+    await asyncio.gather(*(send_alert_sequence(alerts, sem) for alerts in alert_sequences))
+
+async def send_alert_sequence(alerts, sem):
+    """Send alerts in order, releasing each one only once the webhook reports the previous one processed"""
+    for alert_name, request in alerts:
+        # The webhook handles an alert before responding, so a processed response is the barrier;
+        # the client's 30s timeout bounds the wait without cancelling an alert the server is still running
+        response = await send_alert(alert_name, request, sem)
+        
+        if response is None or response.status_code != 200:
+            log.error(f"❌ {alert_name} was not processed, stopping sequence")
+            return
+
+async def send_alert(alert_name, request, sem):
+    """POST a single alert, given as alert_request()'s (body, headers), and report the result"""
+    body, headers = request
+    async with sem:
+        log.info(f"\n--- {alert_name} ---")
         try:
-            headers = {"Content-Type": "text/plain"}
-            response = requests.post(webhook_url, data=alert_data, headers=headers, timeout=30)
+            response = await client.post(webhook_url, content=body, headers=headers)
             
-            print(f"Status: {response.status_code}")
+            log.info(f"Status: {response.status_code}")
             if response.status_code == 200:
-                print(f"✅ {alert_name} successful!")
+                log.info(f"✅ {alert_name} successful!")
                 try:
-                    result = json.loads(response.text) if response.text else {}
-                    print(f"Response: {result}")
+                    result = loads(response.content) if response.content else {}
+                    log.info(f"Response: {result}")
                 except:
-                    print(f"Response: {response.text}")
+                    log.info(f"Response: {response.text}")
             else:
-                print(f"❌ {alert_name} failed!")
-                print(f"Error: {response.text}")
-                
-            # Wait a bit between alerts
-            import time
-            time.sleep(3)
+                log.error(f"❌ {alert_name} failed!")
+                log.info(f"Error: {response.text}")
+            
+            return response
             
         except Exception as e:
-            print(f"❌ Error with {alert_name}: {e}")
+            log.error(f"❌ Error with {alert_name}: {e}")
+
+async def main():
+    try:
+        # Test single alert
+        await test_webhook()
+        
+        # Test multiple alerts to verify cancellation
+        await test_multiple_alerts()
+    finally:
+        await aclose()
 
 if __name__ == "__main__":
-    print("🧪 Testing Tradovate Webhook with Order Cancellation")
-    print("This will test:")
-    print("1. Single alert processing")
-    print("2. Multiple alerts with order cancellation")
-    print("3. OCO/OSO bracket order placement")
-    
-    # Test single alert
-    test_webhook()
+    log.info(_BANNER)
     
-    # Test multiple alerts to verify cancellation
-    test_multiple_alerts()
+    run(main())
     
-    print("\n" + "="*50)
-    print("Test completed. Check the webhook logs for detailed results.")
+    log.info(_FOOTER)
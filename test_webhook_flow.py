@@ -1,15 +1,15 @@
-import asyncio
+import os
 import httpx
-import json
+from _console import log
+from _jsonfmt import pretty, loads
+from _runner import run
+from _webhook_client import client, aclose, alert_request, orchestrate, latency_percentiles
 
-async def test_webhook_flow():
-    """
-    Test the complete webhook flow with position closure.
-    """
-    print("🔥🔥🔥 TESTING COMPLETE WEBHOOK FLOW 🔥🔥🔥")
-    
-    # Sample TradingView alert
-    test_alert = """={
+# Number of copies of the alert to replay after the flow test (0 disables the load run)
+LOAD_ALERTS = int(os.getenv("LOAD_ALERTS", "0"))
+
+# Sample TradingView alert
+test_alert = """={
     "symbol": "NQ1!",
     "timestamp": "2024-01-01T12:00:00Z"
 }
@@ -19,34 +19,69 @@ T1=18550.00
 T2=18600.00
 T3=18650.00
 STOP=18450.00"""
+alert_fields = {
+    "symbol": "NQ1!",
+    "timestamp": "2024-01-01T12:00:00Z",
+    "action": "Buy",
+    "PRICE": 18500.00,
+    "T1": 18550.00,
+    "T2": 18600.00,
+    "T3": 18650.00,
+    "STOP": 18450.00
+}
+
+# Request body is encoded once at import and reused for every send
+_ALERT_BODY, _ALERT_HEADERS = alert_request(test_alert, alert_fields)
+
+async def test_webhook_flow():
+    """
+    Test the complete webhook flow with position closure.
+    """
+    log.info("🔥🔥🔥 TESTING COMPLETE WEBHOOK FLOW 🔥🔥🔥")
     
     webhook_url = "http://localhost:10000/webhook"
     
     try:
-        async with httpx.AsyncClient() as client:
-            print("📤 Sending test alert to webhook...")
-            print(f"Alert data:\n{test_alert}")
+        log.info("📤 Sending test alert to webhook...")
+        log.info(f"Alert data:\n{test_alert}")
+        
+        response = await client.post(
+            webhook_url,
+            content=_ALERT_BODY,
+            headers=_ALERT_HEADERS,
+            timeout=60.0
+        )
+        
+        if response.status_code == 200:
+            result = loads(response.content)
+            log.info("✅ Webhook processed successfully!")
+            log.info(f"Response: {pretty(result)}")
+        else:
+            log.error(f"❌ Webhook failed with status {response.status_code}")
+            log.info(f"Error: {response.text}")
             
-            response = await client.post(
-                webhook_url,
-                content=test_alert,
-                headers={"Content-Type": "text/plain"},
-                timeout=60.0
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Webhook processed successfully!")
-                print(f"Response: {json.dumps(result, indent=2)}")
-            else:
-                print(f"❌ Webhook failed with status {response.status_code}")
-                print(f"Error: {response.text}")
-                
     except httpx.ConnectError:
-        print("❌ Could not connect to webhook server")
-        print("   Make sure the webhook server is running: python main.py")
+        log.error("❌ Could not connect to webhook server")
+        log.info("   Make sure the webhook server is running: python main.py")
     except Exception as e:
-        print(f"❌ Error testing webhook: {e}")
+        log.error(f"❌ Error testing webhook: {e}")
+
+async def run_webhook_load(webhook_url="http://localhost:10000/webhook"):
+    """Replay the alert LOAD_ALERTS times concurrently and report status counts and latency"""
+    log.info(f"\n📈 Replaying alert {LOAD_ALERTS} times...")
+    results = await orchestrate(webhook_url, [_ALERT_BODY] * LOAD_ALERTS, _ALERT_HEADERS)
+    ok = sum(1 for status, _ in results if status == 200)
+    log.info(f"✅ {ok}/{len(results)} alerts returned 200")
+    for name, value in latency_percentiles(results).items():
+        log.info(f"   {name}: {value:.1f} ms")
+
+async def main():
+    try:
+        await test_webhook_flow()
+        if LOAD_ALERTS:
+            await run_webhook_load()
+    finally:
+        await aclose()
 
 if __name__ == "__main__":
-    asyncio.run(test_webhook_flow())
+    run(main())
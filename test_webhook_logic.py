@@ -3,10 +3,30 @@
 Test webhook payload to verify stop order placement logic
 """
 
-import asyncio
-import json
 import httpx
 import time
+from types import MappingProxyType
+from _console import log
+from _jsonfmt import pretty, loads
+from _runner import run
+
+# Optional: typed validation of the prepared stop order in a single C pass
+try:
+    import msgspec
+
+    class StopOrder(msgspec.Struct):
+        accountId: int
+        symbol: str
+        action: str
+        orderQty: int
+        orderType: str = "Stop"
+        stopPrice: float = 0.0
+        timeInForce: str = "GTC"
+        isAutomated: bool = True
+
+    MSGSPEC_ENABLED = True
+except ImportError:
+    MSGSPEC_ENABLED = False
 
 # Sample webhook payload that should trigger the stop order placement logic
 webhook_payload = {
@@ -17,11 +37,29 @@ webhook_payload = {
     "STOP": 18550.0     # Stop loss
 }
 
+# Read-only order templates; each alert copies one and overrides the varying fields
+_STOP_TEMPLATE = MappingProxyType({
+    "accountId": 0,
+    "symbol": "",
+    "action": "",
+    "orderQty": 1,
+    "orderType": "Stop",
+    "stopPrice": 0.0,
+    "timeInForce": "GTC",
+    "isAutomated": True
+})
+_TP_TEMPLATE = MappingProxyType({"label": "TP1", "action": "", "orderType": "Limit", "price": 0.0, "qty": 1})
+_ENTRY_TEMPLATE = MappingProxyType({"label": "ENTRY", "action": "", "orderType": "Stop", "stopPrice": 0.0, "qty": 1})
+
+# Fields the parsed alert and the prepared stop order must carry
+_REQ = frozenset({"symbol", "action", "PRICE", "T1", "STOP"})
+_REQ_STOP = frozenset({"accountId", "symbol", "action", "orderQty", "orderType", "stopPrice"})
+
 async def test_webhook_processing():
     """Test sending a webhook payload to verify the logic"""
     
-    print("Testing webhook payload processing...")
-    print(f"Payload: {json.dumps(webhook_payload, indent=2)}")
+    log.info("Testing webhook payload processing...")
+    log.info(f"Payload: {pretty(webhook_payload)}")
     
     # Import the parsing function
     try:
@@ -34,37 +72,38 @@ PRICE={webhook_payload['PRICE']}
 T1={webhook_payload['T1']}
 STOP={webhook_payload['STOP']}"""
         
-        print(f"Alert text to parse:\n{alert_text}")
+        log.info(f"Alert text to parse:\n{alert_text}")
         
         parsed_data = parse_alert_to_tradovate_json(alert_text, 18653267)
-        print(f"✓ Parsed data: {json.dumps(parsed_data, indent=2)}")
+        log.info(f"✓ Parsed data: {pretty(parsed_data)}")
         
         # Test hash generation
         alert_hash = hash_alert(parsed_data)
-        print(f"✓ Generated hash: {alert_hash}")
+        log.info(f"✓ Generated hash: {alert_hash}")
         
         # Verify all required fields are present
-        required_fields = ["symbol", "action", "PRICE", "T1", "STOP"]
-        for field in required_fields:
-            if field not in parsed_data:
-                print(f"❌ Missing field: {field}")
-                return False
-            else:
-                print(f"✓ Found {field}: {parsed_data[field]}")
+        missing = _REQ - parsed_data.keys()
+        if missing:
+            log.error(f"❌ Missing fields: {sorted(missing)}")
+            return False
+        log.info(f"✓ Found all required fields: {sorted(_REQ)}")
         
-        print("✓ Webhook payload parsing test passed!")
+        log.info("✓ Webhook payload parsing test passed!")
         return True
         
     except Exception as e:
-        print(f"❌ Error in webhook processing test: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"❌ Error in webhook processing test: {e}")
         return False
 
+def bracket_prices_valid(action, price, take_profit, stop):
+    """Take profit and stop must sit on opposite sides of the entry for the trade direction"""
+    side = 1.0 if action.lower() == "buy" else -1.0
+    return side * (take_profit - price) > 0 and side * (price - stop) > 0
+
 async def verify_stop_order_logic():
     """Verify the stop order preparation logic"""
     
-    print("\nVerifying stop order preparation logic...")
+    log.info("\nVerifying stop order preparation logic...")
     
     try:
         # Simulate the order plan creation logic from webhook
@@ -77,74 +116,129 @@ async def verify_stop_order_logic():
             "STOP": 18550.0
         }
         
+        # Check the bracket geometry before building any orders
+        if not bracket_prices_valid(action, data["PRICE"], data["T1"], data["STOP"]):
+            log.error(f"❌ Invalid bracket prices for {action}: {data}")
+            return False
+        log.info("✓ Bracket prices valid for trade direction")
+        
         # Create order plan (from webhook logic)
         order_plan = []
         stop_order_data = None
         
         # Add take profit order
         if "T1" in data:
-            order_plan.append({
-                "label": "TP1",
-                "action": "Sell" if action.lower() == "buy" else "Buy",
-                "orderType": "Limit",
-                "price": data["T1"],
-                "qty": 1
-            })
-            print(f"✓ Added TP1 order: {data['T1']}")
+            tp_order = _TP_TEMPLATE.copy()
+            tp_order["action"] = "Sell" if action.lower() == "buy" else "Buy"
+            tp_order["price"] = data["T1"]
+            order_plan.append(tp_order)
+            log.info(f"✓ Added TP1 order: {data['T1']}")
         
         # Add entry order
         if "PRICE" in data:
-            order_plan.append({
-                "label": "ENTRY", 
-                "action": action,
-                "orderType": "Stop",
-                "stopPrice": data["PRICE"],
-                "qty": 1
-            })
-            print(f"✓ Added ENTRY order: {data['PRICE']}")
+            entry_order = _ENTRY_TEMPLATE.copy()
+            entry_order["action"] = action
+            entry_order["stopPrice"] = data["PRICE"]
+            order_plan.append(entry_order)
+            log.info(f"✓ Added ENTRY order: {data['PRICE']}")
         
         # Prepare stop order (will be placed after entry fills)
         if "STOP" in data:
-            stop_order_data = {
-                "accountId": 18653267,
-                "symbol": "NQM5",
-                "action": "Sell" if action.lower() == "buy" else "Buy", 
-                "orderQty": 1,
-                "orderType": "Stop",
-                "stopPrice": data["STOP"],
-                "timeInForce": "GTC",
-                "isAutomated": True
-            }
-            print(f"✓ Prepared STOP order: {data['STOP']}")
-        
-        print(f"✓ Order plan created with {len(order_plan)} orders")
-        print(f"✓ Stop order data prepared: {stop_order_data is not None}")
+            stop_order_data = _STOP_TEMPLATE.copy()
+            stop_order_data["accountId"] = 18653267
+            stop_order_data["symbol"] = "NQM5"
+            stop_order_data["action"] = "Sell" if action.lower() == "buy" else "Buy"
+            stop_order_data["stopPrice"] = data["STOP"]
+            log.info(f"✓ Prepared STOP order: {data['STOP']}")
+        
+        log.info(f"✓ Order plan created with {len(order_plan)} orders")
+        log.info(f"✓ Stop order data prepared: {stop_order_data is not None}")
         
         # Verify stop order data has all required fields
         if stop_order_data:
-            required_fields = ["accountId", "symbol", "action", "orderQty", "orderType", "stopPrice"]
-            for field in required_fields:
-                if field not in stop_order_data:
-                    print(f"❌ Missing required field in stop_order_data: {field}")
+            missing = _REQ_STOP - stop_order_data.keys()
+            if missing:
+                log.error(f"❌ Missing required fields in stop_order_data: {sorted(missing)}")
+                return False
+            log.info(f"✓ Stop order has all required fields: {sorted(_REQ_STOP)}")
+            
+            if MSGSPEC_ENABLED:
+                try:
+                    stop_order = msgspec.convert(stop_order_data, StopOrder)
+                except msgspec.ValidationError as e:
+                    log.error(f"❌ Invalid stop_order_data: {e}")
                     return False
-                else:
-                    print(f"✓ Stop order has {field}: {stop_order_data[field]}")
+                log.info(f"✓ Stop order types valid: {msgspec.json.encode(stop_order).decode()}")
         
-        print("✓ Stop order logic verification passed!")
+        log.info("✓ Stop order logic verification passed!")
         return True
         
     except Exception as e:
-        print(f"❌ Error in stop order logic verification: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"❌ Error in stop order logic verification: {e}")
         return False
 
+def _reference_parse(alert_text: str) -> dict:
+    """The original line-splitting alert parser, kept as the reference for ALERT_LINE_RE"""
+    parsed_data = {}
+    if alert_text.startswith("="):
+        json_part, alert_text = alert_text[1:].split("\n", 1)
+        parsed_data.update(loads(json_part))
+    for line in alert_text.split("\n"):
+        if "=" in line:
+            key, value = line.split("=", 1)
+            parsed_data[key.strip()] = value.strip()
+        elif line.strip().upper() in ["BUY", "SELL"]:
+            parsed_data["action"] = line.strip().capitalize()
+    for target in ["T1", "STOP", "PRICE"]:
+        if target in parsed_data:
+            parsed_data[target] = float(parsed_data[target])
+    return parsed_data
+
+# Alerts with \r\n endings and unusual whitespace around keys, values and '='
+_PARITY_ALERTS = (
+    '={"symbol":"CME_MINI:NQ1!"}\r\nBUY\r\nPRICE=21402.25\r\nT1=21407.0445\r\nSTOP=21391.25\r\n',
+    "symbol = NQM5\n  sell \r\nPRICE\t=\t18600.0 \nT1 =18650.0\r\nSTOP= 18550.0\t\r",
+    "symbol\x0b=\x0cNQM5\xa0\n\xa0Buy\nPRICE \u2003= 18600.0\nSTOP=18550.0",
+    "symbol=NQM5\nBUY = 2\nsell\nnote=a = b\nempty=\n=\n\r\nSTOP=18550.0\r\n",
+)
+
+def check_alert_parser_parity():
+    """ALERT_LINE_RE must parse alerts exactly like the original line splitter"""
+    from main import parse_alert_to_tradovate_json
+    
+    for alert_text in _PARITY_ALERTS:
+        expected = _reference_parse(alert_text)
+        try:
+            parsed = parse_alert_to_tradovate_json(alert_text, 18653267)
+        except ValueError as e:
+            log.error(f"❌ Regex parser rejected {alert_text!r}: {e}\n  reference: {expected}")
+            return False
+        if parsed != expected:
+            log.error(f"❌ Parser mismatch for {alert_text!r}:\n  regex:     {parsed}\n  reference: {expected}")
+            return False
+    log.info(f"✓ Regex parser matches the line parser on {len(_PARITY_ALERTS)} alerts")
+    return True
+
+def test_alert_parser_parity():
+    assert check_alert_parser_parity()
+
+_PASSED_SUMMARY = """✓ ALL VERIFICATION TESTS PASSED!
+The stop order placement logic is correctly implemented.
+
+Key points verified:
+- Webhook payload parsing works correctly
+- Stop order data is properly prepared
+- All required fields are present
+- Logic follows the correct flow:
+  1. Parse alert -> 2. Create order plan -> 3. Prepare stop data
+  4. Place ENTRY/TP orders -> 5. Monitor -> 6. Place STOP when ENTRY fills"""
+
 async def main():
     """Run all verification tests"""
     
-    print("=" * 60)
-    print("WEBHOOK STOP ORDER LOGIC VERIFICATION")
-    print("=" * 60)
+    log.info("=" * 60)
+    log.info("WEBHOOK STOP ORDER LOGIC VERIFICATION")
+    log.info("=" * 60)
     
     # Test 1: Webhook payload parsing
     test1_result = await test_webhook_processing()
@@ -152,30 +246,22 @@ async def main():
     # Test 2: Stop order logic
     test2_result = await verify_stop_order_logic()
     
-    print("\n" + "=" * 60)
-    if test1_result and test2_result:
-        print("✓ ALL VERIFICATION TESTS PASSED!")
-        print("The stop order placement logic is correctly implemented.")
-        print("\nKey points verified:")
-        print("- Webhook payload parsing works correctly")
-        print("- Stop order data is properly prepared") 
-        print("- All required fields are present")
-        print("- Logic follows the correct flow:")
-        print("  1. Parse alert -> 2. Create order plan -> 3. Prepare stop data")
-        print("  4. Place ENTRY/TP orders -> 5. Monitor -> 6. Place STOP when ENTRY fills")
+    # Test 3: Regex alert parser against the original line parser
+    test3_result = check_alert_parser_parity()
+    
+    log.info("\n" + "=" * 60)
+    if test1_result and test2_result and test3_result:
+        log.info(_PASSED_SUMMARY)
     else:
-        print("❌ VERIFICATION TESTS FAILED!")
-        print("There are issues with the stop order logic.")
-    print("=" * 60)
+        log.error("❌ VERIFICATION TESTS FAILED!\nThere are issues with the stop order logic.")
+    log.info("=" * 60)
     
-    return test1_result and test2_result
+    return test1_result and test2_result and test3_result
 
 if __name__ == "__main__":
     try:
-        result = asyncio.run(main())
+        result = run(main())
         exit(0 if result else 1)
     except Exception as e:
-        print(f"Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"Unexpected error: {e}")
         exit(1)
@@ -1,9 +1,13 @@
 import httpx
 import os
 import logging
-import json  # Added for pretty-printing JSON responses
+import orjson  # C-backed JSON for request bodies, responses and logged payloads
 import asyncio  # Added for retry logic
 import httpx  # Added for HTTP requests
+import random
+import time
+from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
 from fastapi import HTTPException
 
@@ -14,16 +18,329 @@ load_dotenv()
 TRADOVATE_DEMO = os.getenv("TRADOVATE_DEMO", "true") == "true"
 BASE_URL = "https://demo-api.tradovate.com/v1" if TRADOVATE_DEMO else "https://live-api.tradovate.com/v1"
 
+# Hardcoded account from .env, parsed once at import rather than on every (re)authentication
+_ENV_ACCOUNT_ID = int(os.getenv("TRADOVATE_ACCOUNT_ID")) if os.getenv("TRADOVATE_ACCOUNT_ID") else None
+_ENV_ACCOUNT_SPEC = os.getenv("TRADOVATE_ACCOUNT_SPEC")
+
+
+# Re-authenticate a little before Tradovate's 90-minute access token lifetime runs out
+TOKEN_TTL_SECONDS = 75 * 60
+
+# Worker count for bulk cancel/close so bursts stay under Tradovate's rate limits
+MAX_CONCURRENT_REQUESTS = 8
+# Bound on queued bulk jobs; producers wait for workers once it fills
+FAN_OUT_QUEUE_SIZE = 32
+
+# Pause after a liquidation pass so the next position fetch sees the fills
+POSITION_SETTLE_DELAY = 0.25
+
+# Account id/spec discovered via /account/list, kept across restarts (keyed by API host and user)
+ACCOUNT_CACHE_PATH = Path.home() / ".cache" / "tradovate" / "account.json"
+# Cached accounts older than this are re-fetched, so a renamed or closed account is picked up
+ACCOUNT_CACHE_TTL_SECONDS = 24 * 60 * 60
+# Order responses that suggest the account id is wrong; a cached account is dropped on these
+_ACCOUNT_ERROR_STATUSES = frozenset({400, 403, 404})
+
+# Order statuses that still count as pending (not yet filled, cancelled or rejected)
+_PENDING_STATUSES = frozenset({"Pending", "Working", "Submitted"})
+
+# Exponential backoff with full jitter, so clients rate-limited together do not retry in lockstep
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+
+def _backoff_delay(attempt: int, retry_after: str = None) -> float:
+    """Seconds to wait before retry `attempt`, honouring a numeric Retry-After header when present"""
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def _load_account_cache() -> dict:
+    try:
+        cache = orjson.loads(ACCOUNT_CACHE_PATH.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_account_cache(cache: dict):
+    try:
+        ACCOUNT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        ACCOUNT_CACHE_PATH.write_bytes(orjson.dumps(cache))
+    except OSError as e:
+        logging.warning(f"Could not write account cache {ACCOUNT_CACHE_PATH}: {e}")
+
+
+def _cached_account(cache_key: str):
+    """Returns (account_id, account_spec) from the cache, or None when the entry is missing, malformed or stale"""
+    entry = _load_account_cache().get(cache_key)
+    if not isinstance(entry, dict):
+        return None
+    account_id, account_spec, saved_at = entry.get("id"), entry.get("name"), entry.get("saved_at")
+    if not isinstance(account_id, int) or not isinstance(account_spec, str) or not account_spec:
+        return None
+    if not isinstance(saved_at, (int, float)) or time.time() - saved_at > ACCOUNT_CACHE_TTL_SECONDS:
+        return None
+    return account_id, account_spec
+
+
+def _save_account_cache(cache_key: str, account_id: int, account_spec: str):
+    cache = _load_account_cache()
+    cache[cache_key] = {"id": account_id, "name": account_spec, "saved_at": time.time()}
+    _write_account_cache(cache)
+
+
+def _drop_account_cache(cache_key: str):
+    cache = _load_account_cache()
+    if cache.pop(cache_key, None) is not None:
+        _write_account_cache(cache)
+
+
+def _stop_order(target_price: float) -> dict:
+    """Order configuration for a Stop entry at target_price"""
+    return {"orderType": "Stop", "stopPrice": target_price}
+
+
+class _LazyJSON:
+    """Log argument that defers JSON encoding until a handler actually formats the record"""
+    __slots__ = ("obj",)
+
+
+    def __init__(self, obj):
+        self.obj = obj
+
+
+    def __str__(self):
+        if isinstance(self.obj, bytes):
+            return self.obj.decode()
+        return orjson.dumps(self.obj).decode()
+
 
 class TradovateClient:
+    _shared = None
+
+    # Fixed fields of each order payload; per-call fields are merged over them
+    _DEFAULT_ORDER = MappingProxyType({"orderType": "limit", "timeInForce": "GTC", "isAutomated": True})
+    _STOP_ORDER = MappingProxyType({"action": "Sell", "orderType": "stop", "timeInForce": "GTC", "isAutomated": True})
+    _MARKET_CLOSE = MappingProxyType({"orderType": "Market", "timeInForce": "GTC", "isAutomated": True})
+
+
     def __init__(self):
         self.access_token = None
         self.account_id = None
         self.account_spec = None
+        self.token_expires_at = 0.0
+        # asyncio.Lock binds to the loop it is first awaited on, so one is made per running loop
+        self._auth_lock = None
+        self._auth_lock_loop = None
+        # contractId -> symbol for positions that arrive without a symbol; contracts never change name
+        self._contract_symbol = {}
+        # Set while account_id/account_spec came from the on-disk cache rather than /account/list
+        self._account_cache_key = None
+        # JSON of _DEFAULT_ORDER + accountId without the closing brace, rebuilt when the account changes
+        self._order_prefix = None
+        self._order_prefix_account = None
+        # One keep-alive pool for every API call instead of a new TLS connection per request;
+        # over HTTP/2 concurrent requests multiplex on a single connection
+        self._client = httpx.AsyncClient(
+            base_url=BASE_URL,
+            # Bodies are pre-encoded with orjson and sent as content=, so the type is set here
+            headers={"Content-Type": "application/json"},
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=60),
+            timeout=10.0
+        )
+
+
+    @classmethod
+    def shared(cls):
+        """Process-wide client, so every `async with TradovateClient.shared()` reuses one login"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+
+    @classmethod
+    async def close_shared(cls):
+        """Close the process-wide client's pool; the next shared() call builds a fresh client"""
+        if cls._shared is not None:
+            shared, cls._shared = cls._shared, None
+            await shared.aclose()
+
+
+    def _token_expired(self) -> bool:
+        return not self.access_token or time.monotonic() >= self.token_expires_at
+
+
+    def _get_auth_lock(self) -> asyncio.Lock:
+        """Auth lock for the running event loop, replaced when the client is used from another loop"""
+        loop = asyncio.get_running_loop()
+        if self._auth_lock_loop is not loop:
+            self._auth_lock = asyncio.Lock()
+            self._auth_lock_loop = loop
+        return self._auth_lock
+
+
+    async def _ensure_token(self):
+        """Authenticate if the token is missing or near expiry, sharing one login across concurrent callers"""
+        # Double-checked so concurrent callers share a single authentication round trip
+        if self._token_expired():
+            async with self._get_auth_lock():
+                if self._token_expired():
+                    await self.authenticate()
+
+
+    async def __aenter__(self):
+        await self._ensure_token()
+        return self
+
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # The connection pool outlives the block so the shared client can be re-entered;
+        # see aclose() / close_shared()
+        return False
+
+
+    async def aclose(self):
+        """Close the connection pool; call once when the process shuts down"""
+        await self._client.aclose()
+
+
+    async def _lookup_account(self):
+        """
+        Returns (account_id, account_spec) for the logged-in user, from the on-disk cache
+        when it holds a valid, fresh entry and from /account/list otherwise.
+        """
+        cache_key = f"{BASE_URL}|{os.getenv('TRADOVATE_USERNAME')}"
+        cached = _cached_account(cache_key)
+        if cached:
+            logging.info(f"Using cached account for {cache_key}: {cached}")
+            self._account_cache_key = cache_key
+            return cached
+        self._account_cache_key = None
+
+
+        acc_res = await self._request_with_retry("GET", "/account/list")
+        acc_res.raise_for_status()
+        account_data = orjson.loads(acc_res.content)
+        logging.info("Account list response: %s", _LazyJSON(account_data))
+        account_id = account_data[0]["id"]
+        account_spec = account_data[0].get("name")
+        if account_id and account_spec:
+            _save_account_cache(cache_key, account_id, account_spec)
+        return account_id, account_spec
+
+
+    def _invalidate_cached_account(self, response: httpx.Response):
+        """
+        Drops the cached account after an account-related 4xx and expires the token,
+        so the next call re-authenticates and re-fetches /account/list.
+        """
+        if self._account_cache_key is None or response.status_code not in _ACCOUNT_ERROR_STATUSES:
+            return
+        logging.warning(f"{response.request.url.path} returned {response.status_code} with a cached account; dropping the cache entry")
+        _drop_account_cache(self._account_cache_key)
+        self._account_cache_key = None
+        self.token_expires_at = 0.0
+
+
+    async def _request_with_retry(self, method: str, path: str, max_retries: int = 3, **kwargs):
+        """
+        Sends an idempotent request, retrying 429s and connection errors with jittered backoff.
+        Order placement does not go through here, since a retried POST could place an order twice.
+        """
+        for attempt in range(max_retries):
+            last_attempt = attempt == max_retries - 1
+            try:
+                response = await self._client.request(method, path, **kwargs)
+                if response.status_code != 429 or last_attempt:
+                    return response
+                delay = _backoff_delay(attempt, response.headers.get("Retry-After"))
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                delay = _backoff_delay(attempt)
+            logging.warning(f"{method} {path} failed (attempt {attempt + 1}/{max_retries}). Retrying after {delay:.2f} seconds...")
+            await asyncio.sleep(delay)
+
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        """Authenticated GET of an API path relative to BASE_URL, retried on 429s and connection errors"""
+        await self._ensure_token()
+        return await self._request_with_retry("GET", path, **kwargs)
+
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        """Authenticated POST to an API path relative to BASE_URL; sent once, never retried"""
+        await self._ensure_token()
+        return await self._client.post(path, **kwargs)
+
+
+    def _default_order_body(self, symbol: str, action: str, quantity: int) -> bytes:
+        """place_order's default payload, appending only the per-call fields to the cached static prefix"""
+        if self._order_prefix_account != self.account_id:
+            self._order_prefix = orjson.dumps({**self._DEFAULT_ORDER, "accountId": self.account_id})[:-1]
+            self._order_prefix_account = self.account_id
+        return b"".join((
+            self._order_prefix,
+            b',"action":', orjson.dumps(action),
+            b',"symbol":', orjson.dumps(symbol),
+            b',"orderQty":', orjson.dumps(quantity),
+            b"}",
+        ))
+
+
+    async def _post_order(self, path: str, payload):
+        """POSTs an order payload, given as a dict or an already-encoded JSON body"""
+        body = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+        response = await self._client.post(path, content=body)
+        self._invalidate_cached_account(response)
+        return response
+
+
+    async def _fan_out(self, func, items):
+        """
+        Runs func(item) for every item on a fixed pool of MAX_CONCURRENT_REQUESTS workers
+        fed through a bounded queue. Returns results in input order, with the exception
+        in place of the result for any call that failed.
+        """
+        if not items:
+            return []
+
+
+        results = [None] * len(items)
+        queue = asyncio.Queue(maxsize=FAN_OUT_QUEUE_SIZE)
+
+
+        async def worker():
+            while (job := await queue.get()) is not None:
+                index, item = job
+                try:
+                    results[index] = await func(item)
+                except Exception as e:
+                    results[index] = e
+
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(MAX_CONCURRENT_REQUESTS, len(items)))]
+        try:
+            for job in enumerate(items):
+                await queue.put(job)
+            # One sentinel per worker once every job is queued
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        return results
 
 
     async def authenticate(self):
-        url = f"{BASE_URL}/auth/accesstokenrequest"
+        url = "/auth/accesstokenrequest"
         auth_payload = {
             "name": os.getenv("TRADOVATE_USERNAME"),
             "password": os.getenv("TRADOVATE_PASSWORD"),
@@ -34,64 +351,67 @@ class TradovateClient:
             "deviceId": os.getenv("TRADOVATE_DEVICE_ID")
         }
         max_retries = 5
-        backoff_factor = 2
 
 
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient() as client:
-                    logging.debug(f"Sending authentication payload: {json.dumps(auth_payload, indent=2)}")
-                    r = await client.post(url, json=auth_payload)
-                    r.raise_for_status()
-                    data = r.json()
-                    logging.info(f"Authentication response: {json.dumps(data, indent=2)}")
-                    self.access_token = data["accessToken"]
+                logging.debug("Sending authentication payload: %s", _LazyJSON(auth_payload))
+                r = await self._client.post(url, content=orjson.dumps(auth_payload))
+                r.raise_for_status()
+                logging.debug("Tradovate API negotiated %s", r.http_version)
+                data = orjson.loads(r.content)
+                logging.info("Authentication response: %s", _LazyJSON(data))
+                self.access_token = data["accessToken"]
+                self.token_expires_at = time.monotonic() + TOKEN_TTL_SECONDS
+                # Sent automatically on every request through the shared client
+                self._client.headers["Authorization"] = f"Bearer {self.access_token}"
 
 
-                    # Fetch account ID
-                    headers = {"Authorization": f"Bearer {self.access_token}"}
-                    acc_res = await client.get(f"{BASE_URL}/account/list", headers=headers)
-                    acc_res.raise_for_status()
-                    account_data = acc_res.json()
-                    logging.info(f"Account list response: {json.dumps(account_data, indent=2)}")
-                    self.account_id = account_data[0]["id"]
-                    self.account_spec = account_data[0].get("name")
+                # Fetch account ID, unless .env already supplies both values
+                if _ENV_ACCOUNT_ID is None or not _ENV_ACCOUNT_SPEC:
+                    self.account_id, self.account_spec = await self._lookup_account()
 
 
-                    # Use hardcoded values from .env if available
-                    self.account_id = int(os.getenv("TRADOVATE_ACCOUNT_ID", self.account_id))
-                    self.account_spec = os.getenv("TRADOVATE_ACCOUNT_SPEC", self.account_spec)
+                # Use hardcoded values from .env if available
+                if _ENV_ACCOUNT_ID is not None:
+                    self.account_id = _ENV_ACCOUNT_ID
+                if _ENV_ACCOUNT_SPEC is not None:
+                    self.account_spec = _ENV_ACCOUNT_SPEC
 
 
-                    logging.info(f"Using account_id: {self.account_id} and account_spec: {self.account_spec} from environment variables.")
+                logging.info(f"Using account_id: {self.account_id} and account_spec: {self.account_spec} from environment variables.")
 
 
-                    if not self.account_spec:
-                        logging.error("Failed to retrieve accountSpec. accountSpec is None.")
-                        raise HTTPException(status_code=400, detail="Failed to retrieve accountSpec")
+                if not self.account_spec:
+                    logging.error("Failed to retrieve accountSpec. accountSpec is None.")
+                    raise HTTPException(status_code=400, detail="Failed to retrieve accountSpec")
 
 
-                    logging.info(f"Retrieved accountSpec: {self.account_spec}")
-                    logging.info(f"Retrieved accountId: {self.account_id}")
+                logging.info(f"Retrieved accountSpec: {self.account_spec}")
+                logging.info(f"Retrieved accountId: {self.account_id}")
 
 
-                    if not self.account_id:
-                        logging.error("Failed to retrieve account ID. Account ID is None.")
-                        raise HTTPException(status_code=400, detail="Failed to retrieve account ID")
+                if not self.account_id:
+                    logging.error("Failed to retrieve account ID. Account ID is None.")
+                    raise HTTPException(status_code=400, detail="Failed to retrieve account ID")
 
 
-                    logging.info("Authentication successful. Access token, accountSpec, and account ID retrieved.")
-                    return  # Exit the retry loop on success
+                logging.info("Authentication successful. Access token, accountSpec, and account ID retrieved.")
+                return  # Exit the retry loop on success
 
 
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429:  # Handle rate-limiting
-                    retry_after = int(e.response.headers.get("Retry-After", backoff_factor * (attempt + 1)))
-                    logging.warning(f"Rate-limited (429). Retrying after {retry_after} seconds...")
+                    retry_after = _backoff_delay(attempt, e.response.headers.get("Retry-After"))
+                    logging.warning(f"Rate-limited (429). Retrying after {retry_after:.2f} seconds...")
                     await asyncio.sleep(retry_after)
                 else:
                     logging.error(f"Authentication failed: {e.response.text}")
                     raise HTTPException(status_code=e.response.status_code, detail="Authentication failed")
+            except httpx.TransportError as e:
+                retry_after = _backoff_delay(attempt)
+                logging.warning(f"Connection error during authentication ({e!r}). Retrying after {retry_after:.2f} seconds...")
+                await asyncio.sleep(retry_after)
             except Exception as e:
                 logging.error(f"Unexpected error during authentication: {e}")
                 raise HTTPException(status_code=500, detail="Internal server error during authentication")
@@ -102,41 +422,31 @@ class TradovateClient:
 
 
     async def place_order(self, symbol: str, action: str, quantity: int = 1, order_data: dict = None):
-        if not self.access_token:
-            await self.authenticate()
-
-
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        await self._ensure_token()
 
 
         # Use the provided order_data if available, otherwise construct a default payload
-        order_payload = order_data or {
-            "accountId": self.account_id,
-            "action": action.capitalize(),  # Ensure "Buy" or "Sell"
-            "symbol": symbol,
-            "orderQty": quantity,
-            "orderType": "limit",
-            "timeInForce": "GTC",
-            "isAutomated": True  # Optional field for automation
-        }
+        if order_data:
+            order_payload = order_data
+            account_id = order_data.get("accountId")
+        else:
+            # Ensure "Buy" or "Sell"
+            order_payload = self._default_order_body(symbol, action.capitalize(), quantity)
+            account_id = self.account_id
 
 
-        if not order_payload.get("accountId"):
+        if not account_id:
             logging.error("Missing accountId in order payload.")
             raise HTTPException(status_code=400, detail="Missing accountId in order payload")
 
 
         try:
-            async with httpx.AsyncClient() as client:
-                logging.debug(f"Sending order payload: {json.dumps(order_payload, indent=2)}")
-                r = await client.post(f"{BASE_URL}/order/placeorder", json=order_payload, headers=headers)
-                r.raise_for_status()
-                response_data = r.json()
-                logging.info(f"Order placement response: {json.dumps(response_data, indent=2)}")
-                return response_data
+            logging.debug("Sending order payload: %s", _LazyJSON(order_payload))
+            r = await self._post_order("/order/placeorder", order_payload)
+            r.raise_for_status()
+            response_data = orjson.loads(r.content)
+            logging.info("Order placement response: %s", _LazyJSON(response_data))
+            return response_data
         except httpx.HTTPStatusError as e:
             logging.error(f"Order placement failed: {e.response.text}")
             raise HTTPException(status_code=e.response.status_code, detail=f"Order placement failed: {e.response.text}")
@@ -157,24 +467,16 @@ class TradovateClient:
         Returns:
             dict: The response from the Tradovate API.
         """
-        if not self.access_token:
-            await self.authenticate()
-
-
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        await self._ensure_token()
 
 
         try:
-            async with httpx.AsyncClient() as client:
-                logging.debug(f"Sending OSO order payload: {json.dumps(initial_order, indent=2)}")
-                response = await client.post(f"{BASE_URL}/order/placeoso", json=initial_order, headers=headers)
-                response.raise_for_status()
-                response_data = response.json()
-                logging.info(f"OSO order response: {json.dumps(response_data, indent=2)}")
-                return response_data
+            logging.debug("Sending OSO order payload: %s", _LazyJSON(initial_order))
+            response = await self._post_order("/order/placeoso", initial_order)
+            response.raise_for_status()
+            response_data = orjson.loads(response.content)
+            logging.info("OSO order response: %s", _LazyJSON(response_data))
+            return response_data
         except httpx.HTTPStatusError as e:
             logging.error(f"OSO order placement failed: {e.response.text}")
             raise HTTPException(status_code=e.response.status_code, detail=f"OSO order placement failed: {e.response.text}")
@@ -196,8 +498,7 @@ class TradovateClient:
         Returns:
             dict: The response from the Tradovate API.
         """
-        if not self.access_token:
-            await self.authenticate()
+        await self._ensure_token()
 
 
         if not entry_order_id:
@@ -205,31 +506,22 @@ class TradovateClient:
             raise HTTPException(status_code=400, detail="Invalid ENTRY order ID")
 
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-
-
+        # _STOP_ORDER assumes STOP orders are for selling
         stop_order_payload = {
+            **self._STOP_ORDER,
             "accountId": self.account_id,
-            "action": "Sell",  # Assuming STOP orders are for selling
             "linkedOrderId": entry_order_id,
-            "orderType": "stop",
-            "price": stop_price,
-            "timeInForce": "GTC",
-            "isAutomated": True
+            "price": stop_price
         }
 
 
         try:
-            async with httpx.AsyncClient() as client:
-                logging.debug(f"Sending STOP order payload: {json.dumps(stop_order_payload, indent=2)}")
-                response = await client.post(f"{BASE_URL}/order/placeorder", json=stop_order_payload, headers=headers)
-                response.raise_for_status()
-                response_data = response.json()
-                logging.info(f"STOP order response: {json.dumps(response_data, indent=2)}")
-                return response_data
+            logging.debug("Sending STOP order payload: %s", _LazyJSON(stop_order_payload))
+            response = await self._post_order("/order/placeorder", stop_order_payload)
+            response.raise_for_status()
+            response_data = orjson.loads(response.content)
+            logging.info("STOP order response: %s", _LazyJSON(response_data))
+            return response_data
         except httpx.HTTPStatusError as e:
             logging.error(f"STOP order placement failed: {e.response.text}")
             raise HTTPException(status_code=e.response.status_code, detail=f"STOP order placement failed: {e.response.text}")
@@ -246,27 +538,19 @@ class TradovateClient:
         Returns:
             list: List of pending orders.
         """
-        if not self.access_token:
-            await self.authenticate()
-
-
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        await self._ensure_token()
 
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{BASE_URL}/order/list", headers=headers)
-                response.raise_for_status()
-                orders = response.json()
+            response = await self._request_with_retry("GET", "/order/list")
+            response.raise_for_status()
+            orders = orjson.loads(response.content)
                
-                # Filter for pending orders only
-                pending_orders = [order for order in orders if order.get("ordStatus") in ["Pending", "Working", "Submitted"]]
-                logging.info(f"Found {len(pending_orders)} pending orders")
-                logging.debug(f"Pending orders: {json.dumps(pending_orders, indent=2)}")
-                return pending_orders
+            # Filter for pending orders only
+            pending_orders = [order for order in orders if order.get("ordStatus") in _PENDING_STATUSES]
+            logging.info(f"Found {len(pending_orders)} pending orders")
+            logging.debug("Pending orders: %s", _LazyJSON(pending_orders))
+            return pending_orders
                
         except httpx.HTTPStatusError as e:
             logging.error(f"Failed to get orders: {e.response.text}")
@@ -285,14 +569,7 @@ class TradovateClient:
         Returns:
             dict: The response from the Tradovate API.
         """
-        if not self.access_token:
-            await self.authenticate()
-
-
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        await self._ensure_token()
 
 
         cancel_payload = {
@@ -301,13 +578,12 @@ class TradovateClient:
 
 
         try:
-            async with httpx.AsyncClient() as client:
-                logging.debug(f"Canceling order {order_id}")
-                response = await client.post(f"{BASE_URL}/order/cancelorder", json=cancel_payload, headers=headers)
-                response.raise_for_status()
-                response_data = response.json()
-                logging.info(f"Order {order_id} cancelled successfully: {json.dumps(response_data, indent=2)}")
-                return response_data
+            logging.debug(f"Canceling order {order_id}")
+            response = await self._request_with_retry("POST", "/order/cancelorder", content=orjson.dumps(cancel_payload))
+            response.raise_for_status()
+            response_data = orjson.loads(response.content)
+            logging.info("Order %s cancelled successfully: %s", order_id, _LazyJSON(response_data))
+            return response_data
                
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
@@ -333,22 +609,23 @@ class TradovateClient:
             pending_orders = await self.get_pending_orders()
             cancelled_orders = []
            
-            for order in pending_orders:
-                order_id = order.get("id")
-                if order_id:
-                    try:
-                        result = await self.cancel_order(order_id)
-                        cancelled_orders.append(result)
-                        logging.info(f"Successfully cancelled order {order_id}")
-                    except HTTPException as e:
-                        # If it's a 404, the order is already handled (filled/cancelled)
-                        if e.status_code == 404:
-                            logging.info(f"Order {order_id} already filled/cancelled (404)")
-                            cancelled_orders.append({"id": order_id, "status": "already_handled"})
-                        else:
-                            logging.error(f"Failed to cancel order {order_id}: {e.detail}")
-                    except Exception as e:
-                        logging.error(f"Failed to cancel order {order_id}: {e}")
+            # Cancels are independent, so send them concurrently
+            order_ids = [order.get("id") for order in pending_orders if order.get("id")]
+            results = await self._fan_out(self.cancel_order, order_ids)
+           
+            for order_id, result in zip(order_ids, results):
+                if isinstance(result, HTTPException):
+                    # If it's a 404, the order is already handled (filled/cancelled)
+                    if result.status_code == 404:
+                        logging.info(f"Order {order_id} already filled/cancelled (404)")
+                        cancelled_orders.append({"id": order_id, "status": "already_handled"})
+                    else:
+                        logging.error(f"Failed to cancel order {order_id}: {result.detail}")
+                elif isinstance(result, BaseException):
+                    logging.error(f"Failed to cancel order {order_id}: {result}")
+                else:
+                    cancelled_orders.append(result)
+                    logging.info(f"Successfully cancelled order {order_id}")
                        
             logging.info(f"Cancelled {len(cancelled_orders)} out of {len(pending_orders)} pending orders")
             return cancelled_orders
@@ -369,14 +646,7 @@ class TradovateClient:
         Returns:
             dict: The response from the Tradovate API.
         """
-        if not self.access_token:
-            await self.authenticate()
-
-
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        await self._ensure_token()
 
 
         # OCO requires a different format - orders as an array
@@ -386,13 +656,12 @@ class TradovateClient:
 
 
         try:
-            async with httpx.AsyncClient() as client:
-                logging.debug(f"Sending OCO order payload: {json.dumps(oco_payload, indent=2)}")
-                response = await client.post(f"{BASE_URL}/order/placeoco", json=oco_payload, headers=headers)
-                response.raise_for_status()
-                response_data = response.json()
-                logging.info(f"OCO order response: {json.dumps(response_data, indent=2)}")
-                return response_data
+            logging.debug("Sending OCO order payload: %s", _LazyJSON(oco_payload))
+            response = await self._post_order("/order/placeoco", oco_payload)
+            response.raise_for_status()
+            response_data = orjson.loads(response.content)
+            logging.info("OCO order response: %s", _LazyJSON(response_data))
+            return response_data
         except httpx.HTTPStatusError as e:
             logging.error(f"OCO order placement failed: {e.response.text}")
             raise HTTPException(status_code=e.response.status_code, detail=f"OCO order placement failed: {e.response.text}")
@@ -409,37 +678,28 @@ class TradovateClient:
         Returns:
             list: List of open positions.
         """
-        if not self.access_token:
-            await self.authenticate()
-
-
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        await self._ensure_token()
 
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{BASE_URL}/position/list", headers=headers)
-                response.raise_for_status()
-                positions = response.json()
-               
-                # 🔥 ENHANCED POSITION DEBUGGING: Log all position objects for analysis
-                logging.info(f"🔍 RAW POSITIONS RESPONSE: {json.dumps(positions, indent=2)}")
+            response = await self._request_with_retry("GET", "/position/list")
+            response.raise_for_status()
+            positions = orjson.loads(response.content)
                
-                # Filter for open positions only (netPos != 0)
-                open_positions = [pos for pos in positions if pos.get("netPos", 0) != 0]
-                logging.info(f"Found {len(open_positions)} open positions")
+            # Filter for open positions only (netPos != 0)
+            open_positions = [pos for pos in positions if pos.get("netPos")]
+            logging.info("Found %d open positions", len(open_positions))
                
-                # 🔥 ENHANCED DEBUGGING: Log each open position structure
+            # 🔥 ENHANCED POSITION DEBUGGING: raw body and each open position, only when DEBUG is on
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                # Log the body as received rather than re-encoding the parsed list
+                logging.debug("🔍 RAW POSITIONS RESPONSE: %s", response.text)
                 for i, pos in enumerate(open_positions):
-                    logging.info(f"🔍 OPEN POSITION {i+1}: {json.dumps(pos, indent=2)}")
+                    logging.debug("🔍 OPEN POSITION %s: %s", i+1, _LazyJSON(pos))
                     # Log all available fields for debugging
-                    all_fields = list(pos.keys())
-                    logging.info(f"🔍 Available fields in position {i+1}: {all_fields}")
+                    logging.debug("🔍 Available fields in position %s: %s", i+1, list(pos.keys()))
                
-                return open_positions
+            return open_positions
                
         except httpx.HTTPStatusError as e:
             logging.error(f"Failed to get positions: {e.response.text}")
@@ -449,75 +709,51 @@ class TradovateClient:
             raise HTTPException(status_code=500, detail="Internal server error getting positions")
 
 
-    async def close_position(self, symbol: str):
+    async def _positions_by_symbol(self, positions: list = None) -> dict:
+        """Open positions keyed by symbol (first entry wins), fetching them unless a list is given"""
+        if positions is None:
+            positions = await self.get_positions()
+        by_symbol = {}
+        for position in positions:
+            symbol = position.get("symbol")
+            if symbol:
+                by_symbol.setdefault(symbol, position)
+        return by_symbol
+
+
+    async def close_position(self, symbol: str, positions_by_symbol: dict = None):
         """
         Closes a specific position by symbol using a market order.
 
 
         Args:
             symbol (str): The symbol of the position to close.
+            positions_by_symbol (dict): Optional map from _positions_by_symbol() to skip the position fetch.
 
 
         Returns:
             dict: The response from the Tradovate API.
         """
-        if not self.access_token:
-            await self.authenticate()
-
-
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        await self._ensure_token()
 
 
         # First, get the current position for this symbol
         try:
-            positions = await self.get_positions()
-            target_position = None
-           
-            for position in positions:
-                if position.get("symbol") == symbol:
-                    target_position = position
-                    break
+            if positions_by_symbol is None:
+                positions_by_symbol = await self._positions_by_symbol()
+            target_position = positions_by_symbol.get(symbol)
            
             if not target_position:
                 logging.info(f"No open position found for symbol {symbol}")
                 return {"status": "no_position", "message": f"No open position for {symbol}"}
            
-            net_pos = target_position.get("netPos", 0)
-            if net_pos == 0:
+            close_order = self._build_close_order(target_position)
+            if close_order is None:
                 logging.info(f"Position for {symbol} already closed (netPos = 0)")
                 return {"status": "already_closed", "message": f"Position for {symbol} already closed"}
            
-            # Determine the action needed to close the position
-            # If netPos > 0 (long position), we need to sell to close
-            # If netPos < 0 (short position), we need to buy to close
-            close_action = "Sell" if net_pos > 0 else "Buy"
-            close_quantity = abs(net_pos)
-           
-            logging.info(f"Closing position for {symbol}: netPos={net_pos}, action={close_action}, qty={close_quantity}")
-           
-            # Create market order to close position
-            close_order = {
-                "accountSpec": self.account_spec,
-                "accountId": self.account_id,
-                "action": close_action,
-                "symbol": symbol,
-                "orderQty": close_quantity,
-                "orderType": "Market",
-                "timeInForce": "GTC",
-                "isAutomated": True
-            }
-           
             # Place the closing order
-            async with httpx.AsyncClient() as client:
-                logging.debug(f"Placing position close order: {json.dumps(close_order, indent=2)}")
-                response = await client.post(f"{BASE_URL}/order/placeorder", json=close_order, headers=headers)
-                response.raise_for_status()
-                response_data = response.json()
-                logging.info(f"Position close order placed: {json.dumps(response_data, indent=2)}")
-                return response_data
+            return await self._submit_close_order(close_order)
                
         except httpx.HTTPStatusError as e:
             logging.error(f"Failed to close position for {symbol}: {e.response.text}")
@@ -527,6 +763,55 @@ class TradovateClient:
             raise HTTPException(status_code=500, detail="Internal server error closing position")
 
 
+    def _build_close_order(self, position: dict):
+        """
+        Builds the market order that flattens a position.
+
+
+        Args:
+            position (dict): A position from get_positions().
+
+
+        Returns:
+            dict: The order payload, or None if the position is already flat.
+        """
+        net_pos = position.get("netPos", 0)
+        if net_pos == 0:
+            return None
+
+
+        # Determine the action needed to close the position
+        # If netPos > 0 (long position), we need to sell to close
+        # If netPos < 0 (short position), we need to buy to close
+        symbol = position.get("symbol")
+        close_action = "Sell" if net_pos > 0 else "Buy"
+        close_quantity = abs(net_pos)
+
+
+        logging.info(f"Closing position for {symbol}: netPos={net_pos}, action={close_action}, qty={close_quantity}")
+
+
+        # Create market order to close position
+        return {
+            **self._MARKET_CLOSE,
+            "accountSpec": self.account_spec,
+            "accountId": self.account_id,
+            "action": close_action,
+            "symbol": symbol,
+            "orderQty": close_quantity
+        }
+
+
+    async def _submit_close_order(self, close_order: dict):
+        """Posts a close order built by _build_close_order; HTTP errors propagate to the caller"""
+        logging.debug("Placing position close order: %s", _LazyJSON(close_order))
+        response = await self._post_order("/order/placeorder", close_order)
+        response.raise_for_status()
+        response_data = orjson.loads(response.content)
+        logging.info("Position close order placed: %s", _LazyJSON(response_data))
+        return response_data
+
+
     async def close_all_positions(self):
         """
         Closes all open positions for the authenticated account.
@@ -536,20 +821,20 @@ class TradovateClient:
             list: List of close order responses.
         """
         try:
+            # One position fetch, then one liquidation request per open symbol
             positions = await self.get_positions()
             closed_positions = []
            
-            for position in positions:
-                symbol = position.get("symbol")
-                net_pos = position.get("netPos", 0)
-               
-                if symbol and net_pos != 0:
-                    try:
-                        result = await self.close_position(symbol)
-                        closed_positions.append(result)
-                        logging.info(f"Successfully closed position for {symbol}")
-                    except Exception as e:
-                        logging.error(f"Failed to close position for {symbol}: {e}")
+            symbols = [position["symbol"] for position in positions
+                       if position.get("symbol") and position.get("netPos", 0) != 0]
+            results = await self._fan_out(self._submit_liquidation, symbols)
+           
+            for symbol, result in zip(symbols, results):
+                if isinstance(result, BaseException):
+                    logging.error(f"Failed to close position for {symbol}: {result}")
+                else:
+                    closed_positions.append(result)
+                    logging.info(f"Successfully closed position for {symbol}")
                        
             logging.info(f"Closed {len(closed_positions)} positions")
             return closed_positions
@@ -563,14 +848,7 @@ class TradovateClient:
         """
         Aggressively closes all positions and cancels all orders, including take profit limit orders, using multiple strategies.
         """
-        if not self.access_token:
-            await self.authenticate()
-
-
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        await self._ensure_token()
 
 
         logging.info("🔥 Starting aggressive position and order cleanup")        # Step 1: Cancel all pending orders, including take profit limit orders
@@ -582,11 +860,10 @@ class TradovateClient:
                 order_id = order.get("id")
                 if order_id:
                     try:
-                        async with httpx.AsyncClient() as client:
-                            response = await client.post(f"{BASE_URL}/order/cancel/{order_id}", headers=headers)
-                            response.raise_for_status()
-                            cancelled_orders.append(order_id)
-                            logging.info(f"✅ Cancelled order {order_id}")
+                        response = await self._request_with_retry("POST", f"/order/cancel/{order_id}")
+                        response.raise_for_status()
+                        cancelled_orders.append(order_id)
+                        logging.info(f"✅ Cancelled order {order_id}")
                     except httpx.HTTPStatusError as e:
                         if e.response.status_code == 404:
                             logging.info(f"✅ Order {order_id} already filled/cancelled (404)")
@@ -605,6 +882,7 @@ class TradovateClient:
         max_attempts = 3
 
 
+        # Each pass re-fetches positions, so only symbols still open are liquidated again
         for attempt in range(max_attempts):
             try:
                 logging.info(f"🔥 Attempt {attempt + 1}/{max_attempts} to close all positions")
@@ -616,41 +894,32 @@ class TradovateClient:
                     return True
 
 
-                for position in positions:
-                    net_pos = position.get("netPos", 0)
-                    if net_pos == 0:
-                        continue
+                open_positions = [position for position in positions if position.get("netPos", 0) != 0]
+                await self._resolve_contract_symbols(
+                    position.get("contractId") for position in open_positions if not position.get("symbol")
+                )
 
 
-                    symbol = position.get("symbol") or str(position.get("contractId"))
+                symbols = []
+                for position in open_positions:
+                    symbol = position.get("symbol") or self._contract_symbol.get(position.get("contractId"))
                     if not symbol:
+                        # A numeric contract id is not a valid symbol; sending it only produces a rejected order
                         logging.error(f"❌ Could not identify symbol for position: {position}")
                         continue
+                    symbols.append(symbol)
 
 
-                    try:
-                        close_action = "Sell" if net_pos > 0 else "Buy"
-                        close_order = {
-                            "accountSpec": self.account_spec,
-                            "accountId": self.account_id,
-                            "action": close_action,
-                            "symbol": symbol,
-                            "orderQty": abs(net_pos),
-                            "orderType": "Market",
-                            "timeInForce": "IOC",
-                            "isAutomated": True
-                        }
-
-
-                        async with httpx.AsyncClient() as client:
-                            response = await client.post(f"{BASE_URL}/order/placeorder", json=close_order, headers=headers)
-                            response.raise_for_status()
-                            logging.info(f"✅ Closed position for {symbol}")
-                    except Exception as e:
-                        logging.error(f"❌ Failed to close position for {symbol}: {e}")
+                # Liquidate directly; the server works out side and quantity
+                results = await self._fan_out(self._submit_liquidation, symbols)
+                for symbol, result in zip(symbols, results):
+                    if isinstance(result, BaseException):
+                        logging.error(f"❌ Failed to close position for {symbol}: {result}")
+                    else:
+                        logging.info(f"✅ Closed position for {symbol}")
 
 
-                await asyncio.sleep(2)
+                await asyncio.sleep(POSITION_SETTLE_DELAY)
 
 
             except Exception as e:
@@ -670,7 +939,7 @@ class TradovateClient:
             return False
 
 
-    async def liquidate_position(self, symbol: str):
+    async def liquidate_position(self, symbol: str, positions_by_symbol: dict = None):
         """
         🔥 CRITICAL: Liquidates a specific position using the official Tradovate liquidation endpoint.
         This is the most aggressive way to close a position immediately.
@@ -678,30 +947,20 @@ class TradovateClient:
 
         Args:
             symbol (str): The symbol of the position to liquidate.
+            positions_by_symbol (dict): Optional map from _positions_by_symbol() to skip the position fetch.
 
 
         Returns:
             dict: The response from the Tradovate API.
         """
-        if not self.access_token:
-            await self.authenticate()
-
-
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        await self._ensure_token()
 
 
         # First, get the current position for this symbol
         try:
-            positions = await self.get_positions()
-            target_position = None
-           
-            for position in positions:
-                if position.get("symbol") == symbol:
-                    target_position = position
-                    break
+            if positions_by_symbol is None:
+                positions_by_symbol = await self._positions_by_symbol()
+            target_position = positions_by_symbol.get(symbol)
            
             if not target_position:
                 logging.info(f"No open position found for symbol {symbol}")
@@ -714,19 +973,8 @@ class TradovateClient:
            
             logging.info(f"🔥 LIQUIDATING position for {symbol}: netPos={net_pos}")
            
-            # Use the official liquidation endpoint
-            liquidation_payload = {
-                "symbol": symbol
-            }
-           
             # Place the liquidation order
-            async with httpx.AsyncClient() as client:
-                logging.debug(f"Placing liquidation order: {json.dumps(liquidation_payload, indent=2)}")
-                response = await client.post(f"{BASE_URL}/order/liquidateposition", json=liquidation_payload, headers=headers)
-                response.raise_for_status()
-                response_data = response.json()
-                logging.info(f"✅ Position liquidation order placed: {json.dumps(response_data, indent=2)}")
-                return response_data
+            return await self._submit_liquidation(symbol)
                
         except httpx.HTTPStatusError as e:
             logging.error(f"Failed to liquidate position for {symbol}: {e.response.text}")
@@ -736,6 +984,22 @@ class TradovateClient:
             raise HTTPException(status_code=500, detail="Internal server error liquidating position")
 
 
+    async def _submit_liquidation(self, symbol: str):
+        """Posts to the official liquidation endpoint; HTTP errors propagate to the caller"""
+        liquidation_payload = {
+            "accountId": self.account_id,
+            "symbol": symbol
+        }
+
+
+        logging.debug("Placing liquidation order: %s", _LazyJSON(liquidation_payload))
+        response = await self._post_order("/order/liquidateposition", liquidation_payload)
+        response.raise_for_status()
+        response_data = orjson.loads(response.content)
+        logging.info("✅ Position liquidation order placed: %s", _LazyJSON(response_data))
+        return response_data
+
+
     async def liquidate_all_positions(self):
         """
         🔥 CRITICAL: Liquidates ALL open positions using the official Tradovate liquidation endpoint.
@@ -747,19 +1011,26 @@ class TradovateClient:
         """
         try:
             positions = await self.get_positions()
+            # Fetched once and handed to each liquidate_position call instead of a re-fetch per symbol
+            positions_by_symbol = await self._positions_by_symbol(positions)
             liquidated_positions = []
+
+
+            async def liquidate(symbol):
+                return await self.liquidate_position(symbol, positions_by_symbol)
+
+
+            # Liquidations run concurrently on the bounded worker pool rather than one round trip at a time
+            symbols = [symbol for symbol, position in positions_by_symbol.items()
+                       if position.get("netPos", 0) != 0]
+            results = await self._fan_out(liquidate, symbols)
            
-            for position in positions:
-                symbol = position.get("symbol")
-                net_pos = position.get("netPos", 0)
-               
-                if symbol and net_pos != 0:
-                    try:
-                        result = await self.liquidate_position(symbol)
-                        liquidated_positions.append(result)
-                        logging.info(f"✅ Successfully liquidated position for {symbol}")
-                    except Exception as e:
-                        logging.error(f"❌ Failed to liquidate position for {symbol}: {e}")
+            for symbol, result in zip(symbols, results):
+                if isinstance(result, BaseException):
+                    logging.error(f"❌ Failed to liquidate position for {symbol}: {result}")
+                else:
+                    liquidated_positions.append(result)
+                    logging.info(f"✅ Successfully liquidated position for {symbol}")
                        
             logging.info(f"🔥 Liquidated {len(liquidated_positions)} positions")
             return liquidated_positions
@@ -769,9 +1040,27 @@ class TradovateClient:
             raise HTTPException(status_code=500, detail="Internal server error liquidating positions")
 
 
+    async def _resolve_contract_symbols(self, contract_ids):
+        """Looks up symbols for contract ids not yet cached, in one /contract/items request"""
+        missing = {cid for cid in contract_ids if cid is not None and cid not in self._contract_symbol}
+        if not missing:
+            return
+        try:
+            response = await self._request_with_retry(
+                "GET", "/contract/items", params={"ids": ",".join(map(str, sorted(missing)))}
+            )
+            response.raise_for_status()
+            for contract in orjson.loads(response.content):
+                if contract.get("name"):
+                    self._contract_symbol[contract["id"]] = contract["name"]
+        except Exception as e:
+            logging.error(f"❌ Failed to resolve contract symbols for {sorted(missing)}: {e}")
+
+
     async def determine_optimal_order_type(self, symbol: str, action: str, target_price: float) -> dict:
         """
-        Intelligently determines whether to use Stop or Limit orders based on market conditions.
+        Returns the entry order configuration for target_price. Without market data this is
+        always a Stop order, for both directions; symbol and action are kept for callers.
        
         Args:
             symbol (str): Trading symbol
@@ -779,31 +1068,7 @@ class TradovateClient:
             target_price (float): The target entry price
            
         Returns:
-            dict: Order configuration with orderType, price/stopPrice
+            dict: Order configuration with orderType and stopPrice
         """
-        try:
-            # For now, use a simple fallback strategy
-            # This can be enhanced with real market data in the future
-           
-            # Default to Stop orders for breakout strategies
-            if action.lower() == "buy":
-                # For BUY orders, use Stop order (breakout above current price)
-                return {
-                    "orderType": "Stop",
-                    "stopPrice": target_price
-                }
-            else:
-                # For SELL orders, use Stop order (breakdown below current price)  
-                return {
-                    "orderType": "Stop",
-                    "stopPrice": target_price
-                }
-               
-        except Exception as e:
-            logging.error(f"Error in determine_optimal_order_type: {e}")
-            # Fallback to Stop orders
-            return {
-                "orderType": "Stop",
-                "stopPrice": target_price
-            }
-
+        # No market data yet: both directions use a Stop order (breakout above / breakdown below)
+        return _stop_order(target_price)
@@ -2,40 +2,118 @@
 import httpx
 import os
 import logging
-import json
+import orjson  # C-backed JSON for request bodies, responses and logged payloads
 import asyncio
+from datetime import datetime, timezone
+from types import MappingProxyType
 from dotenv import load_dotenv
 from fastapi import HTTPException
+from tradovate_api import _stop_order  # Shared Stop entry template
 
 load_dotenv()
 
 TRADOVATE_DEMO = os.getenv("TRADOVATE_DEMO", "true") == "true"
 BASE_URL = "https://demo-api.tradovate.com/v1" if TRADOVATE_DEMO else "https://live-api.tradovate.com/v1"
 
+# Hardcoded account from .env, parsed once at import rather than on every (re)authentication
+_ENV_ACCOUNT_ID = int(os.getenv("TRADOVATE_ACCOUNT_ID")) if os.getenv("TRADOVATE_ACCOUNT_ID") else None
+_ENV_ACCOUNT_SPEC = os.getenv("TRADOVATE_ACCOUNT_SPEC")
+
+# Order statuses that still count as pending (not yet filled, cancelled or rejected)
+_PENDING_STATUSES = frozenset(("Pending", "Working", "Submitted"))
+
+# 🚀 SPEED: Re-authenticate in the background this long before the token's expirationTime
+TOKEN_REFRESH_MARGIN = 5 * 60
+# Token lifetime assumed when the auth response has no usable expirationTime (Tradovate issues 90-minute tokens)
+TOKEN_DEFAULT_LIFETIME = 90 * 60
+# Pause before retrying a failed background refresh
+TOKEN_REFRESH_RETRY_SECONDS = 30
+
+
+def _token_lifetime(data: dict) -> float:
+    """Seconds until the token in an auth response expires, from its ISO-8601 expirationTime"""
+    try:
+        expires = datetime.fromisoformat(data["expirationTime"].replace("Z", "+00:00"))
+        return (expires - datetime.now(timezone.utc)).total_seconds()
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return TOKEN_DEFAULT_LIFETIME
+
+# Cap on in-flight cancel/close requests during a parallel fan-out, to stay under Tradovate's rate limit
+MAX_CONCURRENT_REQUESTS = 10
+
+# 🚀 SPEED: Post-cleanup verification polls positions every 100ms for up to ~1s
+VERIFY_POLL_ATTEMPTS = 10
+VERIFY_POLL_INTERVAL = 0.1
+
+
+class _LazyJSON:
+    """🚀 SPEED: Log argument that is only JSON-encoded if a handler actually emits the record"""
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        return orjson.dumps(self.obj).decode()
+
+# 🚀 SPEED OPTIMIZATION: One connection pool per process, shared by every TradovateClient
+_shared_http_client = None
+_CLIENT_TIMEOUT = httpx.Timeout(connect=3.0, read=8.0, write=3.0, pool=None)  # Reduced timeouts
+# Keep idle connections for 90s (httpx default is 5s, which expires between webhook alerts)
+_CONNECTION_LIMITS = httpx.Limits(max_keepalive_connections=15, max_connections=30, keepalive_expiry=90.0)
+
+async def close_http_client():
+    """Close the process-wide connection pool; call once from the application's shutdown hook"""
+    global _shared_http_client
+    if _shared_http_client:
+        # Detach before awaiting aclose() so a concurrent caller builds a fresh client
+        # instead of being handed the one being closed
+        client, _shared_http_client = _shared_http_client, None
+        await client.aclose()
+
 class TradovateClient:
+    # Fixed fields of each order payload; per-call fields are merged over them
+    _DEFAULT_ORDER = MappingProxyType({"orderType": "limit", "timeInForce": "GTC", "isAutomated": True})
+    # 🚀 SPEED: Immediate or Cancel for fastest execution
+    _FAST_CLOSE = MappingProxyType({"orderType": "Market", "timeInForce": "IOC", "isAutomated": True})
+
     def __init__(self):
         self.access_token = None
         self.account_id = None
         self.account_spec = None
-        # 🚀 SPEED OPTIMIZATION: Connection pooling for faster HTTP requests
-        self._http_client = None
-        self._client_timeout = httpx.Timeout(connect=3.0, read=8.0, write=3.0, pool=None)  # Reduced timeouts
-        self._connection_limits = httpx.Limits(max_keepalive_connections=15, max_connections=30)  # Increased limits
+        # Request headers built once per access token in authenticate() and shared by every call;
+        # kept as httpx.Headers so httpx copies the already-encoded bytes instead of re-encoding them
+        self._bearer = None
+        self._auth_headers = None
+        self._auth_headers_noct = None
+        # Bounds the parallel cancel/close bursts so they do not turn into a wave of 429s
+        self._fanout_sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Background task that keeps the token fresh so webhooks never authenticate inline
+        self._refresh_task = None
+        # Seconds from the last successful authenticate() until the background refresh is due
+        self._refresh_delay = TOKEN_DEFAULT_LIFETIME - TOKEN_REFRESH_MARGIN
+        # contractId -> symbol for positions that arrive without a symbol; contracts never change name
+        self._contract_symbol = {}
 
     async def _get_http_client(self):
-        """🚀 SPEED OPTIMIZATION: Get reusable HTTP client with connection pooling"""
-        if self._http_client is None:
-            self._http_client = httpx.AsyncClient(
-                timeout=self._client_timeout,
-                limits=self._connection_limits
+        """🚀 SPEED OPTIMIZATION: Get the process-wide HTTP client with connection pooling"""
+        global _shared_http_client
+        # No await between the check and the assignment, so concurrent callers on the event loop
+        # cannot both see None; the first one creates the client and the rest reuse it
+        if _shared_http_client is None:
+            # 🚀 SPEED: HTTP/2 multiplexes parallel cancels/closes as streams on one TLS connection
+            _shared_http_client = httpx.AsyncClient(
+                http2=True,
+                timeout=_CLIENT_TIMEOUT,
+                limits=_CONNECTION_LIMITS
             )
-        return self._http_client
+        return _shared_http_client
 
     async def close_client(self):
-        """Close the HTTP client connection pool"""
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
+        """Stop this client's background token refresh; the shared pool is closed by close_http_client()"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
 
     async def authenticate(self):
         url = f"{BASE_URL}/auth/accesstokenrequest"
@@ -55,25 +133,31 @@ class TradovateClient:
             try:
                 # 🚀 SPEED OPTIMIZATION: Use persistent HTTP client
                 client = await self._get_http_client()
-                logging.debug(f"Sending authentication payload: {json.dumps(auth_payload, indent=2)}")
-                r = await client.post(url, json=auth_payload)
+                logging.debug("Sending authentication payload: %s", _LazyJSON(auth_payload))
+                r = await client.post(url, content=orjson.dumps(auth_payload), headers={"Content-Type": "application/json"})
                 r.raise_for_status()
-                data = r.json()
-                logging.info(f"Authentication response: {json.dumps(data, indent=2)}")
+                data = orjson.loads(r.content)
+                logging.info("Authentication response: %s", _LazyJSON(data))
                 self.access_token = data["accessToken"]
-
-                # 🚀 SPEED: Parallel fetch account ID using the same client
-                headers = {"Authorization": f"Bearer {self.access_token}"}
-                acc_res = await client.get(f"{BASE_URL}/account/list", headers=headers)
-                acc_res.raise_for_status()
-                account_data = acc_res.json()
-                logging.info(f"Account list response: {json.dumps(account_data, indent=2)}")
-                self.account_id = account_data[0]["id"]
-                self.account_spec = account_data[0].get("name")
+                self._bearer = f"Bearer {self.access_token}".encode("ascii")
+                self._auth_headers_noct = httpx.Headers([(b"Authorization", self._bearer)])
+                self._auth_headers = httpx.Headers([(b"Authorization", self._bearer), (b"Content-Type", b"application/json")])
+                self._refresh_delay = max(_token_lifetime(data) - TOKEN_REFRESH_MARGIN, TOKEN_REFRESH_RETRY_SECONDS)
+
+                # 🚀 SPEED: Skip the /account/list round trip when .env already supplies both values
+                if _ENV_ACCOUNT_ID is None or not _ENV_ACCOUNT_SPEC:
+                    acc_res = await client.get(f"{BASE_URL}/account/list", headers=self._auth_headers_noct)
+                    acc_res.raise_for_status()
+                    account_data = orjson.loads(acc_res.content)
+                    logging.info("Account list response: %s", _LazyJSON(account_data))
+                    self.account_id = account_data[0]["id"]
+                    self.account_spec = account_data[0].get("name")
 
                 # Use hardcoded values from .env if available
-                self.account_id = int(os.getenv("TRADOVATE_ACCOUNT_ID", self.account_id))
-                self.account_spec = os.getenv("TRADOVATE_ACCOUNT_SPEC", self.account_spec)
+                if _ENV_ACCOUNT_ID is not None:
+                    self.account_id = _ENV_ACCOUNT_ID
+                if _ENV_ACCOUNT_SPEC is not None:
+                    self.account_spec = _ENV_ACCOUNT_SPEC
 
                 logging.info(f"Using account_id: {self.account_id} and account_spec: {self.account_spec} from environment variables.")
 
@@ -89,6 +173,9 @@ class TradovateClient:
                     raise HTTPException(status_code=400, detail="Failed to retrieve account ID")
 
                 logging.info("Authentication successful. Access token, accountSpec, and account ID retrieved.")
+                # 🚀 SPEED: Start the refresh loop once; a refresh from inside the loop finds it still running
+                if self._refresh_task is None or self._refresh_task.done():
+                    self._refresh_task = asyncio.create_task(self._refresh_loop())
                 return  # Exit the retry loop on success
 
             except httpx.HTTPStatusError as e:
@@ -106,24 +193,40 @@ class TradovateClient:
         logging.error("Max retries reached. Authentication failed.")
         raise HTTPException(status_code=429, detail="Authentication failed after maximum retries")
 
+    def _clear_token(self):
+        """Drop the current token so the next API call re-authenticates inline"""
+        self.access_token = None
+        self._bearer = None
+        self._auth_headers = None
+        self._auth_headers_noct = None
+
+    async def _refresh_loop(self):
+        """🚀 SPEED: Re-authenticate shortly before the token expires, off the webhook's critical path"""
+        delay = self._refresh_delay
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.authenticate()
+                delay = self._refresh_delay
+            except Exception as e:
+                # The old token is about to expire (or has), so stop sending it and retry soon
+                logging.error(f"Background token refresh failed: {e}. Retrying in {TOKEN_REFRESH_RETRY_SECONDS}s")
+                self._clear_token()
+                delay = TOKEN_REFRESH_RETRY_SECONDS
+
     async def place_order(self, symbol: str, action: str, quantity: int = 1, order_data: dict = None):
         if not self.access_token:
             await self.authenticate()
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        headers = self._auth_headers
 
         # Use the provided order_data if available, otherwise construct a default payload
         order_payload = order_data or {
+            **self._DEFAULT_ORDER,
             "accountId": self.account_id,
             "action": action.capitalize(),  # Ensure "Buy" or "Sell"
             "symbol": symbol,
-            "orderQty": quantity,
-            "orderType": "limit",
-            "timeInForce": "GTC",
-            "isAutomated": True  # Optional field for automation
+            "orderQty": quantity
         }
 
         if not order_payload.get("accountId"):
@@ -133,11 +236,11 @@ class TradovateClient:
         try:
             # 🚀 SPEED: Use persistent client
             client = await self._get_http_client()
-            logging.debug(f"Sending order payload: {json.dumps(order_payload, indent=2)}")
-            r = await client.post(f"{BASE_URL}/order/placeorder", json=order_payload, headers=headers)
+            logging.debug("Sending order payload: %s", _LazyJSON(order_payload))
+            r = await client.post(f"{BASE_URL}/order/placeorder", content=orjson.dumps(order_payload), headers=headers)
             r.raise_for_status()
-            response_data = r.json()
-            logging.info(f"Order placement response: {json.dumps(response_data, indent=2)}")
+            response_data = orjson.loads(r.content)
+            logging.info("Order placement response: %s", _LazyJSON(response_data))
             return response_data
         except httpx.HTTPStatusError as e:
             logging.error(f"Order placement failed: {e.response.text}")
@@ -154,19 +257,16 @@ class TradovateClient:
         if not self.access_token:
             await self.authenticate()
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        headers = self._auth_headers
 
         try:
             # 🚀 SPEED: Use persistent client
             client = await self._get_http_client()
-            logging.debug(f"Sending OSO order payload: {json.dumps(initial_order, indent=2)}")
-            response = await client.post(f"{BASE_URL}/order/placeoso", json=initial_order, headers=headers)
+            logging.debug("Sending OSO order payload: %s", _LazyJSON(initial_order))
+            response = await client.post(f"{BASE_URL}/order/placeoso", content=orjson.dumps(initial_order), headers=headers)
             response.raise_for_status()
-            response_data = response.json()
-            logging.info(f"OSO order response: {json.dumps(response_data, indent=2)}")
+            response_data = orjson.loads(response.content)
+            logging.info("OSO order response: %s", _LazyJSON(response_data))
             return response_data
         except httpx.HTTPStatusError as e:
             logging.error(f"OSO order placement failed: {e.response.text}")
@@ -182,22 +282,19 @@ class TradovateClient:
         if not self.access_token:
             await self.authenticate()
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        headers = self._auth_headers
 
         try:
             # 🚀 SPEED: Use persistent client
             client = await self._get_http_client()
             response = await client.get(f"{BASE_URL}/order/list", headers=headers)
             response.raise_for_status()
-            orders = response.json()
+            orders = orjson.loads(response.content)
             
             # Filter for pending orders only
-            pending_orders = [order for order in orders if order.get("ordStatus") in ["Pending", "Working", "Submitted"]]
+            pending_orders = [order for order in orders if order.get("ordStatus") in _PENDING_STATUSES]
             logging.info(f"Found {len(pending_orders)} pending orders")
-            logging.debug(f"Pending orders: {json.dumps(pending_orders, indent=2)}")
+            logging.debug("Pending orders: %s", _LazyJSON(pending_orders))
             return pending_orders
                 
         except httpx.HTTPStatusError as e:
@@ -214,10 +311,7 @@ class TradovateClient:
         if not self.access_token:
             await self.authenticate()
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        headers = self._auth_headers
 
         cancel_payload = {
             "orderId": order_id
@@ -227,10 +321,10 @@ class TradovateClient:
             # 🚀 SPEED: Use persistent client
             client = await self._get_http_client()
             logging.debug(f"Canceling order {order_id}")
-            response = await client.post(f"{BASE_URL}/order/cancelorder", json=cancel_payload, headers=headers)
+            response = await client.post(f"{BASE_URL}/order/cancelorder", content=orjson.dumps(cancel_payload), headers=headers)
             response.raise_for_status()
-            response_data = response.json()
-            logging.info(f"Order {order_id} cancelled successfully: {json.dumps(response_data, indent=2)}")
+            response_data = orjson.loads(response.content)
+            logging.info("Order %s cancelled successfully: %s", order_id, _LazyJSON(response_data))
             return response_data
                 
         except httpx.HTTPStatusError as e:
@@ -256,11 +350,13 @@ class TradovateClient:
                 return []
             
             # 🚀 SPEED OPTIMIZATION: Parallel order cancellation
+            client = await self._get_http_client()
+            headers = self._auth_headers
             cancel_tasks = []
             for order in pending_orders:
                 order_id = order.get("id")
                 if order_id:
-                    cancel_tasks.append(self._cancel_order_fast(order_id))
+                    cancel_tasks.append(self._cancel_one(client, headers, order_id))
             
             # Execute all cancellations in parallel
             results = await asyncio.gather(*cancel_tasks, return_exceptions=True)
@@ -279,19 +375,19 @@ class TradovateClient:
             logging.error(f"Error cancelling all pending orders: {e}")
             raise HTTPException(status_code=500, detail="Internal server error cancelling orders")
 
-    async def _cancel_order_fast(self, order_id: int):
-        """🚀 SPEED: Fast order cancellation helper for parallel processing"""
+    async def _cancel_one(self, client, headers, order_id):
+        """🚀 SPEED: Single-request cancel for the parallel path, sharing one client and headers dict"""
         try:
-            result = await self.cancel_order(order_id)
-            logging.info(f"Successfully cancelled order {order_id}")
-            return result
-        except HTTPException as e:
-            if e.status_code == 404:
+            async with self._fanout_sem:
+                response = await client.post(f"{BASE_URL}/order/cancelorder", content=orjson.dumps({"orderId": order_id}), headers=headers)
+            # 🚀 SPEED: Plain status compares; only a real error goes through raise_for_status()
+            if response.status_code // 100 == 2:
+                logging.info(f"Successfully cancelled order {order_id}")
+                return orjson.loads(response.content)
+            if response.status_code == 404:
                 logging.info(f"Order {order_id} already filled/cancelled (404)")
                 return {"id": order_id, "status": "already_handled"}
-            else:
-                logging.error(f"Failed to cancel order {order_id}: {e.detail}")
-                raise
+            response.raise_for_status()
         except Exception as e:
             logging.error(f"Failed to cancel order {order_id}: {e}")
             raise
@@ -303,31 +399,27 @@ class TradovateClient:
         if not self.access_token:
             await self.authenticate()
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        headers = self._auth_headers
 
         try:
             # 🚀 SPEED: Use persistent client
             client = await self._get_http_client()
             response = await client.get(f"{BASE_URL}/position/list", headers=headers)
             response.raise_for_status()
-            positions = response.json()
-            
-            # 🔥 ENHANCED POSITION DEBUGGING: Log all position objects for analysis
-            logging.info(f"🔍 RAW POSITIONS RESPONSE: {json.dumps(positions, indent=2)}")
+            positions = orjson.loads(response.content)
             
             # Filter for open positions only (netPos != 0)
             open_positions = [pos for pos in positions if pos.get("netPos", 0) != 0]
-            logging.info(f"Found {len(open_positions)} open positions")
+            logging.info("Found %d open positions", len(open_positions))
             
-            # 🔥 ENHANCED DEBUGGING: Log each open position structure
-            for i, pos in enumerate(open_positions):
-                logging.info(f"🔍 OPEN POSITION {i+1}: {json.dumps(pos, indent=2)}")
-                # Log all available fields for debugging
-                all_fields = list(pos.keys())
-                logging.info(f"🔍 Available fields in position {i+1}: {all_fields}")
+            # 🔥 ENHANCED POSITION DEBUGGING: raw body and each open position, only when DEBUG is on
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                # Log the body as received rather than re-encoding the parsed list
+                logging.debug("🔍 RAW POSITIONS RESPONSE: %s", response.text)
+                for i, pos in enumerate(open_positions):
+                    logging.debug("🔍 OPEN POSITION %s: %s", i+1, _LazyJSON(pos))
+                    # Log all available fields for debugging
+                    logging.debug("🔍 Available fields in position %s: %s", i+1, list(pos.keys()))
             
             return open_positions
                 
@@ -345,10 +437,7 @@ class TradovateClient:
         if not self.access_token:
             await self.authenticate()
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        headers = self._auth_headers
 
         logging.info("🔥 Starting aggressive position and order cleanup")
         
@@ -360,56 +449,72 @@ class TradovateClient:
             
             pending_orders, positions = await asyncio.gather(pending_orders_task, positions_task)
             
-            # Step 2: Cancel all orders in parallel
-            if pending_orders:
-                cancel_tasks = []
-                client = await self._get_http_client()
-                
-                for order in pending_orders:
-                    order_id = order.get("id")
-                    if order_id:
-                        cancel_tasks.append(self._fast_cancel_order(client, order_id, headers))
-                
-                if cancel_tasks:
-                    await asyncio.gather(*cancel_tasks, return_exceptions=True)
-                    logging.info(f"✅ Processed {len(cancel_tasks)} order cancellations in parallel")
+            # Step 2: Cancel all orders and close all positions in one parallel batch
+            # (cancels target order IDs, closes target symbols, so neither waits on the other)
+            client = await self._get_http_client()
+            cancel_tasks = [
+                self._fast_cancel_order(client, order["id"], headers)
+                for order in pending_orders if order.get("id")
+            ]
+            await self._resolve_contract_symbols(client, [
+                position.get("contractId") for position in positions
+                if position.get("netPos", 0) != 0 and not position.get("symbol")
+            ])
+            close_tasks = []
+            for position in positions:
+                net_pos = position.get("netPos", 0)
+                if net_pos != 0:
+                    symbol = position.get("symbol") or self._contract_symbol.get(position.get("contractId"))
+                    if symbol:
+                        close_tasks.append(self._fast_close_position(client, symbol, net_pos, headers))
+                    else:
+                        # A numeric contract id is not a valid symbol; sending it only produces a rejected order
+                        logging.error(f"❌ No symbol for contract {position.get('contractId')}, cannot close position")
             
-            # Step 3: Close all positions in parallel
-            if positions:
-                close_tasks = []
-                client = await self._get_http_client()
-                
-                for position in positions:
-                    net_pos = position.get("netPos", 0)
-                    if net_pos != 0:
-                        symbol = position.get("symbol") or str(position.get("contractId"))
-                        if symbol:
-                            close_tasks.append(self._fast_close_position(client, symbol, net_pos, headers))
-                
-                if close_tasks:
-                    await asyncio.gather(*close_tasks, return_exceptions=True)
-                    logging.info(f"✅ Processed {len(close_tasks)} position closures in parallel")
+            if cancel_tasks or close_tasks:
+                await asyncio.gather(*cancel_tasks, *close_tasks, return_exceptions=True)
+                logging.info(f"✅ Processed {len(cancel_tasks)} order cancellations and {len(close_tasks)} position closures in parallel")
             
-            # Step 4: Quick verification
-            await asyncio.sleep(1)  # 🚀 SPEED: Reduced verification wait time
-            remaining_positions = await self.get_positions()
+            # Step 3: Quick verification - poll until flat instead of a fixed 1s wait
+            for attempt in range(VERIFY_POLL_ATTEMPTS):
+                remaining_positions = await self.get_positions()
+                if not remaining_positions:
+                    logging.info("✅ All positions successfully closed with speed optimization")
+                    return True
+                if attempt < VERIFY_POLL_ATTEMPTS - 1:
+                    await asyncio.sleep(VERIFY_POLL_INTERVAL)
             
-            if remaining_positions:
-                logging.error(f"❌ {len(remaining_positions)} positions still open after cleanup")
-                return False
-                
-            logging.info("✅ All positions successfully closed with speed optimization")
-            return True
+            logging.error(f"❌ {len(remaining_positions)} positions still open after cleanup")
+            return False
             
         except Exception as e:
             logging.error(f"❌ Error during optimized position closure: {e}")
             return False
 
+    async def _resolve_contract_symbols(self, client, contract_ids):
+        """🚀 SPEED: Look up symbols for contract ids not yet cached, in one /contract/items request"""
+        missing = {cid for cid in contract_ids if cid is not None and cid not in self._contract_symbol}
+        if not missing:
+            return
+        try:
+            response = await client.get(
+                f"{BASE_URL}/contract/items",
+                params={"ids": ",".join(map(str, sorted(missing)))},
+                headers=self._auth_headers_noct
+            )
+            response.raise_for_status()
+            for contract in orjson.loads(response.content):
+                if contract.get("name"):
+                    self._contract_symbol[contract["id"]] = contract["name"]
+        except Exception as e:
+            logging.error(f"❌ Failed to resolve contract symbols for {sorted(missing)}: {e}")
+
     async def _fast_cancel_order(self, client, order_id, headers):
         """🚀 SPEED: Fast order cancellation helper"""
         try:
-            response = await client.post(f"{BASE_URL}/order/cancel/{order_id}", headers=headers)
-            if response.status_code == 200:
+            async with self._fanout_sem:
+                response = await client.post(f"{BASE_URL}/order/cancel/{order_id}", headers=headers)
+            if response.status_code // 100 == 2:
                 logging.info(f"✅ Cancelled order {order_id}")
             elif response.status_code == 404:
                 logging.info(f"✅ Order {order_id} already filled/cancelled (404)")
@@ -423,18 +528,17 @@ class TradovateClient:
         try:
             close_action = "Sell" if net_pos > 0 else "Buy"
             close_order = {
+                **self._FAST_CLOSE,
                 "accountSpec": self.account_spec,
                 "accountId": self.account_id,
                 "action": close_action,
                 "symbol": symbol,
-                "orderQty": abs(net_pos),
-                "orderType": "Market",
-                "timeInForce": "IOC",  # 🚀 SPEED: Immediate or Cancel for fastest execution
-                "isAutomated": True
+                "orderQty": abs(net_pos)
             }
 
-            response = await client.post(f"{BASE_URL}/order/placeorder", json=close_order, headers=headers)
-            if response.status_code == 200:
+            async with self._fanout_sem:
+                response = await client.post(f"{BASE_URL}/order/placeorder", content=orjson.dumps(close_order), headers=headers)
+            if response.status_code // 100 == 2:
                 logging.info(f"✅ Fast closed position for {symbol}")
             else:
                 logging.error(f"❌ Failed to close position for {symbol}: {response.status_code}")
@@ -443,26 +547,7 @@ class TradovateClient:
 
     async def determine_optimal_order_type(self, symbol: str, action: str, target_price: float) -> dict:
         """
-        🚀 SPEED OPTIMIZED: Intelligently determines whether to use Stop or Limit orders
+        🚀 SPEED OPTIMIZED: Stop entry at target_price for both directions, no market data lookup
         """
-        try:
-            # 🚀 SPEED: Immediate decision without market data lookup for fastest execution
-            # Default to Stop orders for breakout strategies (fastest trigger execution)
-            if action.lower() == "buy":
-                return {
-                    "orderType": "Stop",
-                    "stopPrice": target_price
-                }
-            else:
-                return {
-                    "orderType": "Stop",
-                    "stopPrice": target_price
-                }
-                
-        except Exception as e:
-            logging.error(f"Error in determine_optimal_order_type: {e}")
-            # Fallback to Stop orders for speed
-            return {
-                "orderType": "Stop", 
-                "stopPrice": target_price
-            }
+        # 🚀 SPEED: Immediate decision without market data lookup - Stop orders for both directions
+        return _stop_order(target_price)
@@ -3,25 +3,46 @@ This script verifies that the CRITICAL ISSUE has been fixed:
 - The webhook now includes position closure logic
 - TradovateClient has the required position closure methods
 """
+import asyncio
+import mmap
+import re
 
-def verify_main_py_flow():
-    """Verify main.py has the correct webhook flow with position closure."""    print("🔍 VERIFYING MAIN.PY WEBHOOK FLOW...")
-    
-    with open(r"c:\Users\miles\tradovate_webhook\main.py", "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    required_elements = [
-        "STEP 1: Cancel all existing pending orders",
-        "STEP 2: CRITICAL - Close all existing positions",
-        "force_close_all_positions_immediately()",
-        "STEP 3: Create OCO orders",
-        "STEP 4: Place OCO bracket order"
-    ]
-    
-    missing = []
-    for element in required_elements:
-        if element not in content:
-            missing.append(element)
+MAIN_PY_PATH = r"c:\Users\miles\tradovate_webhook\main.py"
+MAIN_PY_REQUIRED = [
+    "STEP 1: Cancel all existing pending orders",
+    "STEP 2: CRITICAL - Close all existing positions",
+    "force_close_all_positions_immediately()",
+    "STEP 3: Create OCO orders",
+    "STEP 4: Place OCO bracket order"
+]
+
+TRADOVATE_API_PATH = r"c:\Users\miles\tradovate_webhook\tradovate_api.py"
+TRADOVATE_API_REQUIRED = [
+    "async def get_all_positions(",
+    "async def close_position_at_market(",
+    "async def close_all_positions(",
+    "async def force_close_all_positions_immediately("
+]
+
+
+def find_missing(path, required):
+    """Return the entries of `required` that do not occur in the file, scanning it once."""
+    # One alternation pass over the memory-mapped bytes instead of a full `in` scan per entry
+    pattern = re.compile(b"|".join(re.escape(item.encode("utf-8")) for item in required))
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        found = set(pattern.findall(mm))
+    return [item for item in required if item.encode("utf-8") not in found]
+
+async def scan_sources():
+    """Scan main.py and tradovate_api.py concurrently in worker threads, off the event loop."""
+    return await asyncio.gather(
+        asyncio.to_thread(find_missing, MAIN_PY_PATH, MAIN_PY_REQUIRED),
+        asyncio.to_thread(find_missing, TRADOVATE_API_PATH, TRADOVATE_API_REQUIRED),
+    )
+
+def verify_main_py_flow(missing):
+    """Report whether main.py has the correct webhook flow with position closure."""
+    print("🔍 VERIFYING MAIN.PY WEBHOOK FLOW...")
     
     if missing:
         print("❌ MAIN.PY MISSING ELEMENTS:")
@@ -32,23 +53,9 @@ def verify_main_py_flow():
         print("✅ MAIN.PY has correct webhook flow with position closure")
         return True
 
-def verify_tradovate_api_methods():
-    """Verify TradovateClient has position closure methods."""
+def verify_tradovate_api_methods(missing):
+    """Report whether TradovateClient has position closure methods."""
     print("\n🔍 VERIFYING TRADOVATE_API.PY METHODS...")
-      with open(r"c:\Users\miles\tradovate_webhook\tradovate_api.py", "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    required_methods = [
-        "async def get_all_positions(",
-        "async def close_position_at_market(",
-        "async def close_all_positions(",
-        "async def force_close_all_positions_immediately("
-    ]
-    
-    missing = []
-    for method in required_methods:
-        if method not in content:
-            missing.append(method)
     
     if missing:
         print("❌ TRADOVATE_API.PY MISSING METHODS:")
@@ -59,13 +66,14 @@ def verify_tradovate_api_methods():
         print("✅ TRADOVATE_API.PY has all required position closure methods")
         return True
 
-def main():
+async def main():
     print("🔥🔥🔥 VERIFYING CRITICAL ISSUE FIX 🔥🔥🔥")
     print("Issue: Script will not close open positions from previous alerts")
     print("=" * 60)
     
-    main_ok = verify_main_py_flow()
-    api_ok = verify_tradovate_api_methods()
+    main_missing, api_missing = await scan_sources()
+    main_ok = verify_main_py_flow(main_missing)
+    api_ok = verify_tradovate_api_methods(api_missing)
     
     print("\n" + "=" * 60)
     if main_ok and api_ok:
@@ -81,4 +89,4 @@ def main():
         print("❌ Some required components are still missing")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())